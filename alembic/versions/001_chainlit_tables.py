@@ -14,6 +14,27 @@ Creates tables for Chainlit's built-in data layer:
 Schema copied from official Chainlit migration:
 https://github.com/Chainlit/chainlit-datalayer/blob/main/prisma/migrations/20250103173917_init_data_layer/migration.sql
 https://github.com/Chainlit/chainlit-datalayer/blob/main/prisma/migrations/20250108095538_add_tags_to_thread/migration.sql
+
+Deviations from the official schema:
+- Primary keys default to time-ordered UUIDv7 instead of random UUIDv4, so
+  inserts append to the right-most B-tree leaf instead of splitting pages
+- UUID key and foreign-key columns use the native 16-byte UUID type instead
+  of TEXT (the data layer's asyncpg binds accept both str and uuid.UUID)
+- Every foreign-key column is indexed (Thread.userId was not upstream), so
+  cascading deletes probe an index instead of scanning the child table
+- Favourited steps get a partial index instead of a GIN index over metadata
+- No standalone Step threadId/startTime indexes: the data layer never filters
+  on startTime alone, and ("threadId", "startTime", "endTime") covers threadId
+- createdAt/endTime indexes are BRIN: rows are appended in time order, so they
+  stay small for range scans. BRIN cannot serve an ORDER BY; the one sort on
+  Step.createdAt, get_favorite_steps()'s ORDER BY "createdAt" DESC, is kept
+  cheap by Step_favorite_idx, which only holds favourited steps
+
+Step is deliberately not range-partitioned by createdAt. Postgres requires every
+unique key on a partitioned table to include the partition column, which would
+break the data layer's INSERT ... ON CONFLICT ("id") upsert and the foreign keys
+that reference Step("id"). Retention should delete by thread instead, letting
+the cascades remove steps, elements and feedback.
 """
 
 from alembic import op
@@ -26,11 +47,36 @@ depends_on: tuple[str, ...] | None = None
 
 
 def upgrade() -> None:
-    """Apply the initial Chainlit schema - exact copy from official migration."""
+    """Apply the initial Chainlit schema (see module docstring for deviations)."""
 
     # Enable pgcrypto extension for UUID generation
     op.execute('CREATE EXTENSION IF NOT EXISTS "pgcrypto"')
 
+    # UUIDv7 generator: 48-bit Unix epoch milliseconds followed by random bits.
+    # Postgres 18 ships a built-in uuidv7() in pg_catalog, which takes precedence
+    # over this one; older servers fall back to this pure-SQL version.
+    op.execute('''
+        CREATE OR REPLACE FUNCTION public.uuidv7() RETURNS uuid AS $$
+            SELECT encode(
+                set_bit(
+                    set_bit(
+                        overlay(
+                            uuid_send(gen_random_uuid())
+                            PLACING substring(
+                                int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint)
+                                FROM 3
+                            )
+                            FROM 1 FOR 6
+                        ),
+                        52, 1
+                    ),
+                    53, 1
+                ),
+                'hex'
+            )::uuid
+        $$ LANGUAGE SQL VOLATILE
+    ''')
+
     # Create StepType enum
     op.execute('''
         DO $$ BEGIN
@@ -43,148 +89,164 @@ def upgrade() -> None:
         END $$
     ''')
 
+    # Each table's DDL runs as one DO block, so it costs one round trip rather
+    # than one per statement. asyncpg prepares every statement it sends, which
+    # rules out plain semicolon-separated strings.
+
     # User table
     op.execute('''
-        CREATE TABLE IF NOT EXISTS "User" (
-            "id" TEXT NOT NULL DEFAULT gen_random_uuid(),
-            "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            "updatedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            "metadata" JSONB NOT NULL,
-            "identifier" TEXT NOT NULL,
-            CONSTRAINT "User_pkey" PRIMARY KEY ("id")
-        )
+        DO $$ BEGIN
+            CREATE TABLE IF NOT EXISTS "User" (
+                "id" UUID NOT NULL DEFAULT uuidv7(),
+                "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                "updatedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                "metadata" JSONB NOT NULL,
+                "identifier" TEXT NOT NULL,
+                CONSTRAINT "User_pkey" PRIMARY KEY ("id")
+            );
+            CREATE INDEX IF NOT EXISTS "User_identifier_idx" ON "User"("identifier");
+            CREATE UNIQUE INDEX IF NOT EXISTS "User_identifier_key" ON "User"("identifier");
+        END $$
     ''')
-    op.execute('CREATE INDEX IF NOT EXISTS "User_identifier_idx" ON "User"("identifier")')
-    op.execute('CREATE UNIQUE INDEX IF NOT EXISTS "User_identifier_key" ON "User"("identifier")')
 
     # Thread table
     op.execute('''
-        CREATE TABLE IF NOT EXISTS "Thread" (
-            "id" TEXT NOT NULL DEFAULT gen_random_uuid(),
-            "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            "updatedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            "deletedAt" TIMESTAMP(3),
-            "name" TEXT,
-            "metadata" JSONB NOT NULL,
-            "userId" TEXT,
-            "tags" TEXT[] DEFAULT ARRAY[]::TEXT[],
-            CONSTRAINT "Thread_pkey" PRIMARY KEY ("id")
-        )
-    ''')
-    op.execute('CREATE INDEX IF NOT EXISTS "Thread_createdAt_idx" ON "Thread"("createdAt")')
-    op.execute('CREATE INDEX IF NOT EXISTS "Thread_name_idx" ON "Thread"("name")')
-
-    # Add foreign key for Thread -> User
-    op.execute('''
-        ALTER TABLE "Thread" ADD CONSTRAINT "Thread_userId_fkey"
-        FOREIGN KEY ("userId") REFERENCES "User"("id") ON DELETE SET NULL ON UPDATE CASCADE
+        DO $$ BEGIN
+            CREATE TABLE IF NOT EXISTS "Thread" (
+                "id" UUID NOT NULL DEFAULT uuidv7(),
+                "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                "updatedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                "deletedAt" TIMESTAMP(3),
+                "name" TEXT,
+                "metadata" JSONB NOT NULL,
+                "userId" UUID,
+                "tags" TEXT[] DEFAULT ARRAY[]::TEXT[],
+                CONSTRAINT "Thread_pkey" PRIMARY KEY ("id")
+            );
+            CREATE INDEX IF NOT EXISTS "Thread_createdAt_idx" ON "Thread"
+            USING BRIN ("createdAt") WITH (pages_per_range = 32);
+            CREATE INDEX IF NOT EXISTS "Thread_name_idx" ON "Thread"("name");
+            -- Backs ON DELETE SET NULL from User and the data layer's per-user thread lookups
+            CREATE INDEX IF NOT EXISTS "Thread_userId_idx" ON "Thread"("userId");
+        END $$
     ''')
 
     # Step table
     op.execute('''
-        CREATE TABLE IF NOT EXISTS "Step" (
-            "id" TEXT NOT NULL DEFAULT gen_random_uuid(),
-            "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            "updatedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            "parentId" TEXT,
-            "threadId" TEXT,
-            "input" TEXT,
-            "metadata" JSONB NOT NULL,
-            "name" TEXT,
-            "output" TEXT,
-            "type" "StepType" NOT NULL,
-            "showInput" TEXT DEFAULT 'json',
-            "isError" BOOLEAN DEFAULT false,
-            "startTime" TIMESTAMP(3) NOT NULL,
-            "endTime" TIMESTAMP(3) NOT NULL,
-            CONSTRAINT "Step_pkey" PRIMARY KEY ("id")
-        )
-    ''')
-    op.execute('CREATE INDEX IF NOT EXISTS "Step_createdAt_idx" ON "Step"("createdAt")')
-    op.execute('CREATE INDEX IF NOT EXISTS "Step_endTime_idx" ON "Step"("endTime")')
-    op.execute('CREATE INDEX IF NOT EXISTS "Step_parentId_idx" ON "Step"("parentId")')
-    op.execute('CREATE INDEX IF NOT EXISTS "Step_startTime_idx" ON "Step"("startTime")')
-    op.execute('CREATE INDEX IF NOT EXISTS "Step_threadId_idx" ON "Step"("threadId")')
-    op.execute('CREATE INDEX IF NOT EXISTS "Step_type_idx" ON "Step"("type")')
-    op.execute('CREATE INDEX IF NOT EXISTS "Step_name_idx" ON "Step"("name")')
-    op.execute('CREATE INDEX IF NOT EXISTS "Step_threadId_startTime_endTime_idx" ON "Step"("threadId", "startTime", "endTime")')
-
-    # Add foreign keys for Step
-    op.execute('''
-        ALTER TABLE "Step" ADD CONSTRAINT "Step_parentId_fkey"
-        FOREIGN KEY ("parentId") REFERENCES "Step"("id") ON DELETE CASCADE ON UPDATE CASCADE
-    ''')
-    op.execute('''
-        ALTER TABLE "Step" ADD CONSTRAINT "Step_threadId_fkey"
-        FOREIGN KEY ("threadId") REFERENCES "Thread"("id") ON DELETE CASCADE ON UPDATE CASCADE
+        DO $$ BEGIN
+            CREATE TABLE IF NOT EXISTS "Step" (
+                "id" UUID NOT NULL DEFAULT uuidv7(),
+                "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                "updatedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                "parentId" UUID,
+                "threadId" UUID,
+                "input" TEXT,
+                "metadata" JSONB NOT NULL,
+                "name" TEXT,
+                "output" TEXT,
+                "type" "StepType" NOT NULL,
+                "showInput" TEXT DEFAULT 'json',
+                "isError" BOOLEAN DEFAULT false,
+                "startTime" TIMESTAMP(3) NOT NULL,
+                "endTime" TIMESTAMP(3) NOT NULL,
+                CONSTRAINT "Step_pkey" PRIMARY KEY ("id")
+            );
+            CREATE INDEX IF NOT EXISTS "Step_createdAt_idx" ON "Step"
+            USING BRIN ("createdAt") WITH (pages_per_range = 32);
+            CREATE INDEX IF NOT EXISTS "Step_endTime_idx" ON "Step"
+            USING BRIN ("endTime") WITH (pages_per_range = 32);
+            CREATE INDEX IF NOT EXISTS "Step_parentId_idx" ON "Step"("parentId");
+            CREATE INDEX IF NOT EXISTS "Step_type_idx" ON "Step"("type");
+            CREATE INDEX IF NOT EXISTS "Step_name_idx" ON "Step"("name");
+            CREATE INDEX IF NOT EXISTS "Step_threadId_startTime_endTime_idx"
+            ON "Step"("threadId", "startTime", "endTime");
+            -- get_favorite_steps() is the only metadata lookup the data layer makes; a
+            -- partial index on that single key is far smaller than GIN over all metadata
+            CREATE INDEX IF NOT EXISTS "Step_favorite_idx" ON "Step"("threadId", "createdAt")
+            WHERE ("metadata"->>'favorite') = 'true';
+        END $$
     ''')
 
     # Element table
     op.execute('''
-        CREATE TABLE IF NOT EXISTS "Element" (
-            "id" TEXT NOT NULL DEFAULT gen_random_uuid(),
-            "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            "updatedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            "threadId" TEXT,
-            "stepId" TEXT NOT NULL,
-            "metadata" JSONB NOT NULL,
-            "mime" TEXT,
-            "name" TEXT NOT NULL,
-            "objectKey" TEXT,
-            "url" TEXT,
-            "chainlitKey" TEXT,
-            "display" TEXT,
-            "size" TEXT,
-            "language" TEXT,
-            "page" INTEGER,
-            "props" JSONB,
-            CONSTRAINT "Element_pkey" PRIMARY KEY ("id")
-        )
-    ''')
-    op.execute('CREATE INDEX IF NOT EXISTS "Element_stepId_idx" ON "Element"("stepId")')
-    op.execute('CREATE INDEX IF NOT EXISTS "Element_threadId_idx" ON "Element"("threadId")')
-
-    # Add foreign keys for Element
-    op.execute('''
-        ALTER TABLE "Element" ADD CONSTRAINT "Element_stepId_fkey"
-        FOREIGN KEY ("stepId") REFERENCES "Step"("id") ON DELETE CASCADE ON UPDATE CASCADE
-    ''')
-    op.execute('''
-        ALTER TABLE "Element" ADD CONSTRAINT "Element_threadId_fkey"
-        FOREIGN KEY ("threadId") REFERENCES "Thread"("id") ON DELETE CASCADE ON UPDATE CASCADE
+        DO $$ BEGIN
+            CREATE TABLE IF NOT EXISTS "Element" (
+                "id" UUID NOT NULL DEFAULT uuidv7(),
+                "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                "updatedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                "threadId" UUID,
+                "stepId" UUID NOT NULL,
+                "metadata" JSONB NOT NULL,
+                "mime" TEXT,
+                "name" TEXT NOT NULL,
+                "objectKey" TEXT,
+                "url" TEXT,
+                "chainlitKey" TEXT,
+                "display" TEXT,
+                "size" TEXT,
+                "language" TEXT,
+                "page" INTEGER,
+                "props" JSONB,
+                CONSTRAINT "Element_pkey" PRIMARY KEY ("id")
+            );
+            CREATE INDEX IF NOT EXISTS "Element_stepId_idx" ON "Element"("stepId");
+            CREATE INDEX IF NOT EXISTS "Element_threadId_idx" ON "Element"("threadId");
+        END $$
     ''')
 
     # Feedback table
     op.execute('''
-        CREATE TABLE IF NOT EXISTS "Feedback" (
-            "id" TEXT NOT NULL DEFAULT gen_random_uuid(),
-            "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            "updatedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            "stepId" TEXT,
-            "name" TEXT NOT NULL,
-            "value" DOUBLE PRECISION NOT NULL,
-            "comment" TEXT,
-            CONSTRAINT "Feedback_pkey" PRIMARY KEY ("id")
-        )
+        DO $$ BEGIN
+            CREATE TABLE IF NOT EXISTS "Feedback" (
+                "id" UUID NOT NULL DEFAULT uuidv7(),
+                "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                "updatedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                "stepId" UUID,
+                "name" TEXT NOT NULL,
+                "value" DOUBLE PRECISION NOT NULL,
+                "comment" TEXT,
+                CONSTRAINT "Feedback_pkey" PRIMARY KEY ("id")
+            );
+            CREATE INDEX IF NOT EXISTS "Feedback_createdAt_idx" ON "Feedback"
+            USING BRIN ("createdAt") WITH (pages_per_range = 32);
+            CREATE INDEX IF NOT EXISTS "Feedback_name_idx" ON "Feedback"("name");
+            CREATE INDEX IF NOT EXISTS "Feedback_stepId_idx" ON "Feedback"("stepId");
+            CREATE INDEX IF NOT EXISTS "Feedback_value_idx" ON "Feedback"("value");
+            CREATE INDEX IF NOT EXISTS "Feedback_name_value_idx" ON "Feedback"("name", "value");
+        END $$
     ''')
-    op.execute('CREATE INDEX IF NOT EXISTS "Feedback_createdAt_idx" ON "Feedback"("createdAt")')
-    op.execute('CREATE INDEX IF NOT EXISTS "Feedback_name_idx" ON "Feedback"("name")')
-    op.execute('CREATE INDEX IF NOT EXISTS "Feedback_stepId_idx" ON "Feedback"("stepId")')
-    op.execute('CREATE INDEX IF NOT EXISTS "Feedback_value_idx" ON "Feedback"("value")')
-    op.execute('CREATE INDEX IF NOT EXISTS "Feedback_name_value_idx" ON "Feedback"("name", "value")')
 
-    # Add foreign key for Feedback
+    # Foreign keys, added once every table exists. For a restore into populated
+    # tables, add them with NOT VALID and run ALTER TABLE ... VALIDATE CONSTRAINT
+    # afterwards, so the validating scan does not hold a lock that blocks writes.
     op.execute('''
-        ALTER TABLE "Feedback" ADD CONSTRAINT "Feedback_stepId_fkey"
-        FOREIGN KEY ("stepId") REFERENCES "Step"("id") ON DELETE SET NULL ON UPDATE CASCADE
+        DO $$ BEGIN
+            ALTER TABLE "Thread" ADD CONSTRAINT "Thread_userId_fkey"
+            FOREIGN KEY ("userId") REFERENCES "User"("id") ON DELETE SET NULL ON UPDATE CASCADE;
+            ALTER TABLE "Step" ADD CONSTRAINT "Step_parentId_fkey"
+            FOREIGN KEY ("parentId") REFERENCES "Step"("id") ON DELETE CASCADE ON UPDATE CASCADE;
+            ALTER TABLE "Step" ADD CONSTRAINT "Step_threadId_fkey"
+            FOREIGN KEY ("threadId") REFERENCES "Thread"("id") ON DELETE CASCADE ON UPDATE CASCADE;
+            ALTER TABLE "Element" ADD CONSTRAINT "Element_stepId_fkey"
+            FOREIGN KEY ("stepId") REFERENCES "Step"("id") ON DELETE CASCADE ON UPDATE CASCADE;
+            ALTER TABLE "Element" ADD CONSTRAINT "Element_threadId_fkey"
+            FOREIGN KEY ("threadId") REFERENCES "Thread"("id") ON DELETE CASCADE ON UPDATE CASCADE;
+            ALTER TABLE "Feedback" ADD CONSTRAINT "Feedback_stepId_fkey"
+            FOREIGN KEY ("stepId") REFERENCES "Step"("id") ON DELETE SET NULL ON UPDATE CASCADE;
+        END $$
     ''')
 
 
 def downgrade() -> None:
     """Remove all Chainlit tables."""
-    op.execute('DROP TABLE IF EXISTS "Feedback" CASCADE')
-    op.execute('DROP TABLE IF EXISTS "Element" CASCADE')
-    op.execute('DROP TABLE IF EXISTS "Step" CASCADE')
-    op.execute('DROP TABLE IF EXISTS "Thread" CASCADE')
-    op.execute('DROP TABLE IF EXISTS "User" CASCADE')
-    op.execute('DROP TYPE IF EXISTS "StepType"')
+    op.execute('''
+        DO $$ BEGIN
+            DROP TABLE IF EXISTS "Feedback" CASCADE;
+            DROP TABLE IF EXISTS "Element" CASCADE;
+            DROP TABLE IF EXISTS "Step" CASCADE;
+            DROP TABLE IF EXISTS "Thread" CASCADE;
+            DROP TABLE IF EXISTS "User" CASCADE;
+            DROP TYPE IF EXISTS "StepType";
+            DROP FUNCTION IF EXISTS public.uuidv7();
+        END $$
+    ''')
@@ -1,15 +1,20 @@
 """ADVISE node - Present recommendations and handle refinement."""
 
-import json
-
-from langchain_core.messages import AIMessage, HumanMessage
+import asyncio
+import re
+from functools import lru_cache
+from itertools import islice
+
+import orjson
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langgraph.config import get_stream_writer
 from langgraph.types import Command
 from pydantic import BaseModel, Field
 
 from app.models.schemas.shortlist import ComparisonTable
 from app.models.state import AgentState
-from app.services.llm import get_llm_service
-from app.utils.hitl import clear_hitl_flags, parse_hitl_choice
+from app.services.llm import LLMService, get_llm_service
+from app.utils.hitl import CLEARED_HITL_FLAGS, HITL_PREFIX, parse_hitl_choice
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -53,6 +58,145 @@ Only include sections that are genuinely useful based on the data.
 The user can ask follow-up questions, request purchase links/CSV export, ask for more options, add comparison fields, or change requirements."""
 
 
+INTENT_PROMPT_TEMPLATE = """Analyze the user's last message to determine their intent.
+
+User's message: "{user_message}"
+
+Current phase: We have presented product recommendations and the user is now responding.
+
+Possible intents:
+- 'satisfied': User is done and happy with results (e.g., "thanks", "I'll go with this", "that's all")
+- 'more_options': User wants to see more products (e.g., "show me more", "any other options?")
+- 'new_fields': User wants to add comparison dimensions (e.g., "can you add energy efficiency?", "compare warranty")
+- 'change_requirements': User wants to modify search criteria (e.g., "actually my budget is £30", "I want a different brand")
+- 'question': User is asking a follow-up question about current results
+
+What is their primary intent?"""
+
+# Conversation turns sent to the LLM; requirements and table data travel in the
+# system prompt, so older turns mostly add prompt tokens
+MAX_CONTEXT_MESSAGES = 12
+
+# Products included in the table context: top 5 plus 10 for comparative insights
+MAX_CONTEXT_PRODUCTS = 15
+
+# Rendered table context per table version, shared across sessions and turns
+TABLE_CONTEXT_CACHE_SIZE = 64
+_table_context_cache: dict[tuple, str] = {}
+
+# LLM intent classifications per normalised user message and the conversation it
+# was classified in. The classifier reads the recent turns, so "yes" or "add those"
+# only reuse a classification when the context they refer back to is the same
+INTENT_CACHE_SIZE = 256
+_intent_cache: dict[tuple, "UserIntent"] = {}
+
+# Unambiguous phrases that map straight to an intent, skipping the LLM classifier.
+# new_fields is matched separately by _ADD_FIELDS_PATTERN, which also extracts
+# the fields to add.
+_SATISFIED = ("thanks", "thank you", "that's all", "i'm done", "goodbye")
+_MORE_OPTIONS = (
+    "show me more",
+    "find more",
+    "more options",
+    "other options",
+    "more products",
+    "other products",
+    "more choices",
+)
+_REQS_CHANGED = ("change my requirements", "actually my budget")
+
+_INTENT_PHRASES = {
+    "satisfied": _SATISFIED,
+    "more_options": _MORE_OPTIONS,
+    "change_requirements": _REQS_CHANGED,
+}
+
+# Longer messages tend to carry more than one request, so they go to the LLM
+MAX_KEYWORD_MESSAGE_LENGTH = 80
+
+# Whole replies that end the session but are too common to match inside a sentence.
+# "ok" and "great" are left to the LLM: they usually accept an offer in the last reply
+_SATISFIED_REPLIES = frozenset({"done", "perfect", "cheers", "bye"})
+
+# Direct requests to add comparison fields, e.g. "add warranty and noise level"
+_ADD_FIELDS_PATTERN = re.compile(
+    r"^(?:please\s+)?(?:can you\s+|could you\s+)?(?:also\s+)?(?:add|include)\s+"
+    r"(?P<fields>.+?)(?:\s+(?:to the (?:table|comparison)|too|as well))?(?:\s+please)?[.!]*$"
+)
+_FIELD_SEPARATOR = re.compile(r"\s*(?:,|\band\b|&)\s*")
+
+# Words that refer back to something else rather than naming a field
+_NOT_FIELDS = frozenset({"it", "that", "this", "them", "those", "these", "one"})
+
+# Words that name a product attribute. Without one, "add the Breville" or "include
+# cheaper ones" is more likely about products or filters, so the LLM decides
+_FIELD_WORDS = frozenset(
+    {
+        "battery",
+        "brand",
+        "capacity",
+        "color",
+        "colour",
+        "cost",
+        "depth",
+        "dimensions",
+        "efficiency",
+        "energy",
+        "features",
+        "height",
+        "material",
+        "noise",
+        "power",
+        "price",
+        "rating",
+        "ratings",
+        "reviews",
+        "settings",
+        "size",
+        "speed",
+        "temperature",
+        "volume",
+        "warranty",
+        "wattage",
+        "weight",
+        "width",
+    }
+)
+_FIELD_SUFFIX = re.compile(r"\s+(?:column|field)s?$")
+_ARTICLE = re.compile(r"^(?:the|an?)\s+")
+
+# Sent instead of a generated farewell when the user is clearly done
+_FAREWELL_MESSAGE = (
+    "Glad I could help! Good luck with your purchase, and start a new chat "
+    "whenever you want to compare something else."
+)
+
+# Fixed replies. Fresh AIMessages are built from these on each turn: add_messages
+# assigns an id to the message object itself, so reusing one instance would make a
+# repeated reply replace the earlier one in the history instead of appending
+_ERROR_MESSAGE = "I encountered an error processing your request."
+_MORE_OPTIONS_MESSAGE = "Starting a new search for more options..."
+_CHANGE_REQUIREMENTS_MESSAGE = "Let's update your requirements. What would you like to change?"
+_UNKNOWN_INTENT_MESSAGE = "I'm not sure what action to take. Can you clarify?"
+_CLARIFY_MESSAGE = "No problem! Please tell me more about what you'd like to do."
+
+# Synthetic message sent when the user clicks an intent confirmation button
+_HITL_INTENT_PREFIX = f"{HITL_PREFIX}intent:"
+
+# One alternation with a named group per intent, so a single scan tags every match
+_INTENT_PATTERN = re.compile(
+    "|".join(
+        rf"(?P<{intent}>\b(?:{'|'.join(map(re.escape, phrases))})\b)"
+        for intent, phrases in _INTENT_PHRASES.items()
+    )
+)
+
+# A message made up only of sign-offs, e.g. "That's all, thanks!". Sign-offs
+# followed by another request ("Thanks, now add warranty") go to the LLM.
+_SIGN_OFF = rf"(?:{'|'.join(map(re.escape, _SATISFIED))})"
+_SIGN_OFF_PATTERN = re.compile(rf"{_SIGN_OFF}(?:[\s,.!]+{_SIGN_OFF})*[\s.!]*")
+
+
 class UserIntent(BaseModel):
     """Detected user intent from their message in ADVISE phase."""
 
@@ -66,6 +210,13 @@ class UserIntent(BaseModel):
     )
 
 
+# Confirmation text for intents that don't depend on the message details
+_INTENT_DESCRIPTIONS = {
+    "more_options": "It sounds like you'd like me to search for more product options.",
+    "change_requirements": "I understand you'd like to modify your search criteria.",
+}
+
+
 def _get_intent_description(intent_type: str, extracted_fields: list[str] | None = None) -> str:
     """
     Get a human-readable description of the detected intent.
@@ -77,12 +228,278 @@ def _get_intent_description(intent_type: str, extracted_fields: list[str] | None
     Returns:
         Human-readable description
     """
-    descriptions = {
-        "more_options": "It sounds like you'd like me to search for more product options.",
-        "new_fields": f"I'll add {', '.join(extracted_fields) if extracted_fields else 'new fields'} to the comparison.",
-        "change_requirements": "I understand you'd like to modify your search criteria.",
+    return _describe_intent(intent_type, tuple(extracted_fields or ()))
+
+
+@lru_cache(maxsize=256)
+def _describe_intent(intent_type: str, extracted_fields: tuple[str, ...]) -> str:
+    """Build the intent description; cached since the same field requests recur."""
+    if intent_type == "new_fields":
+        return f"I'll add {', '.join(extracted_fields) if extracted_fields else 'new fields'} to the comparison."
+    return _INTENT_DESCRIPTIONS.get(intent_type, "I'll help you with that.")
+
+
+def _match_intent(message: str) -> str | None:
+    """
+    Classify a user message by keyword when the intent is unambiguous.
+
+    Args:
+        message: The user's latest message
+
+    Returns:
+        The intent type, or None if the LLM classifier should decide
+    """
+    if "?" in message or len(message) > MAX_KEYWORD_MESSAGE_LENGTH:
+        return None
+
+    if _is_sign_off(message):
+        return "satisfied"
+
+    intents = {match.lastgroup for match in _INTENT_PATTERN.finditer(message.lower())}
+    # Sign-offs only count as the whole message, checked above
+    return intents.pop() if len(intents) == 1 and "satisfied" not in intents else None
+
+
+def _is_sign_off(message: str) -> bool:
+    """Check whether a user message is nothing but a sign-off, e.g. "Thanks!"."""
+    message = message.strip().lower()
+    return message.rstrip("!.") in _SATISFIED_REPLIES or bool(_SIGN_OFF_PATTERN.fullmatch(message))
+
+
+def _intent_cache_key(message: str, context: list[BaseMessage]) -> tuple:
+    """
+    Get the intent cache key for a user message in its conversation.
+
+    The message is normalised so trivially different phrasings share an entry.
+
+    Args:
+        message: The user's latest message
+        context: Recent messages sent to the classifier alongside it
+
+    Returns:
+        Cache key
+    """
+    return (
+        " ".join(message.lower().split()).rstrip("!."),
+        tuple((msg.type, msg.content) for msg in context if msg.content != message),
+    )
+
+
+def _cache_intent(key: tuple, user_intent: UserIntent) -> None:
+    """Remember the LLM classification of a user message."""
+    if len(_intent_cache) >= INTENT_CACHE_SIZE:
+        # Evict the oldest entry; dicts keep insertion order
+        del _intent_cache[next(iter(_intent_cache))]
+    _intent_cache[key] = user_intent
+
+
+def _match_add_fields(message: str) -> list[str] | None:
+    """
+    Extract the fields from a direct request to add comparison fields.
+
+    Args:
+        message: The user's latest message
+
+    Returns:
+        The requested field names, or None if the LLM classifier should decide
+    """
+    if "?" in message:
+        return None
+
+    match = _ADD_FIELDS_PATTERN.match(message.strip().lower())
+    if not match or _INTENT_PATTERN.search(match["fields"]):
+        return None
+
+    fields = []
+    for field in _FIELD_SEPARATOR.split(match["fields"]):
+        if not field:
+            continue
+        field, named = _FIELD_SUFFIX.subn("", field)
+        field = _ARTICLE.sub("", field)
+        # Field names are short noun phrases; anything longer is likely a different request
+        if field in _NOT_FIELDS or len(field.split()) > 3:
+            return None
+        if not named and _FIELD_WORDS.isdisjoint(field.split()):
+            return None
+        fields.append(field)
+    return fields or None
+
+
+def _recent_messages(messages: list[BaseMessage]) -> list[BaseMessage]:
+    """
+    Get the tail of the conversation to send to the LLM.
+
+    The tail is trimmed to start at a human message, since some providers
+    reject a conversation that opens with an assistant turn.
+
+    Args:
+        messages: Full conversation history
+
+    Returns:
+        At most MAX_CONTEXT_MESSAGES of the latest messages
+    """
+    recent = messages[-MAX_CONTEXT_MESSAGES:]
+    start = next((i for i, msg in enumerate(recent) if msg.type == "human"), 0)
+    return recent[start:]
+
+
+def _dumps(obj: object) -> str:
+    """
+    Serialize prompt context as indented JSON.
+
+    orjson writes UTF-8 directly (the equivalent of ensure_ascii=False); values it
+    can't serialize natively, such as Decimal, fall back to str().
+
+    Args:
+        obj: Object to serialize
+
+    Returns:
+        JSON string
+    """
+    return orjson.dumps(
+        obj, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+    ).decode()
+
+
+def _build_table_context(living_table_data: dict) -> str:
+    """
+    Render the living table as system prompt context.
+
+    Args:
+        living_table_data: Serialized ComparisonTable from state
+
+    Returns:
+        Table data as JSON plus a markdown preview of the top rows
+    """
+    living_table = ComparisonTable.model_validate(living_table_data)
+    field_names = living_table.get_field_names(exclude_internal=True)
+
+    # Build candidates data from living table - include more for comparative insights,
+    # keeping only enriched field values
+    all_candidates = [
+        {
+            "name": row.candidate.name,
+            "manufacturer": row.candidate.manufacturer,
+            **{
+                field_name: cell.value
+                for field_name in field_names
+                if (cell := row.cells.get(field_name)) and cell.value is not None
+            },
+        }
+        for row in islice(living_table.rows.values(), MAX_CONTEXT_PRODUCTS)
+    ]
+
+    # Provide top 5 for main recommendation + additional products for comparative insights
+    table_data = {
+        "total_candidates": living_table.get_row_count(),
+        "qualified_candidates": living_table.get_qualified_count(),
+        "fields": field_names,
+        "top_5_products": all_candidates[:5],
+        "additional_products": all_candidates[
+            5:MAX_CONTEXT_PRODUCTS
+        ],  # Next 10 for "stretch budget", "best value" insights
     }
-    return descriptions.get(intent_type, "I'll help you with that.")
+
+    table_context = f"\n\nComparison Table Data:\n{_dumps(table_data)}"
+
+    # Also include markdown table for easy reference (top 5 only)
+    markdown_table = living_table.to_markdown(max_rows=5)
+    table_context += f"\n\nTable Preview (top 5):\n{markdown_table}"
+
+    return table_context
+
+
+def _get_table_context(living_table_data: dict) -> str:
+    """
+    Get the table context, reusing the cached render while the table is unchanged.
+
+    Args:
+        living_table_data: Serialized ComparisonTable from state
+
+    Returns:
+        Table context for the system prompt
+    """
+    key = ComparisonTable.version_key(living_table_data)
+    table_context = _table_context_cache.get(key)
+    if table_context is None:
+        table_context = _build_table_context(living_table_data)
+        if len(_table_context_cache) >= TABLE_CONTEXT_CACHE_SIZE:
+            # Evict the oldest entry; dicts keep insertion order
+            del _table_context_cache[next(iter(_table_context_cache))]
+        _table_context_cache[key] = table_context
+    return table_context
+
+
+async def _stream_response(
+    llm_service: LLMService,
+    messages: list[BaseMessage],
+    system_context: str,
+    release: asyncio.Event | None = None,
+) -> str:
+    """
+    Generate a response, emitting tokens on the graph's custom stream as they arrive.
+
+    Tokens are only delivered when the workflow is run with stream_mode="custom";
+    under a plain ainvoke the writer is a no-op and this behaves like generate().
+
+    Args:
+        llm_service: LLM service to generate with
+        messages: Conversation history
+        system_context: Table and requirements context for the system prompt
+        release: If given, tokens are buffered until the event is set, so a
+            speculative response can be cancelled before any of it is shown
+
+    Returns:
+        The complete response content
+    """
+    writer = get_stream_writer()
+    chunks = []
+    emitted = 0
+    async for chunk in llm_service.stream(
+        messages, system_prompt=ADVISE_SYSTEM_PROMPT, system_context=system_context
+    ):
+        chunks.append(chunk)
+        if release is None or release.is_set():
+            for token in chunks[emitted:]:
+                writer({"token": token})
+            emitted = len(chunks)
+
+    if release is not None:
+        await release.wait()
+        for token in chunks[emitted:]:
+            writer({"token": token})
+
+    return "".join(chunks)
+
+
+def _advise_command(
+    content: str,
+    phase: str = "advise",
+    goto: str = "__end__",
+    **updates,
+) -> Command:
+    """
+    Build an ADVISE Command that replies with a message and clears HITL flags.
+
+    Args:
+        content: Assistant message to add to the conversation
+        phase: Workflow phase after this turn
+        goto: Next node, or "__end__" to wait for the user
+        **updates: Additional state updates, applied after the cleared HITL flags
+
+    Returns:
+        Command with the state update and routing
+    """
+    return Command(
+        update={
+            "messages": [AIMessage(content=content)],
+            "current_node": "advise",
+            "current_phase": phase,
+            **CLEARED_HITL_FLAGS,
+            **updates,
+        },
+        goto=goto,
+    )
 
 
 async def _execute_confirmed_intent(
@@ -104,63 +521,33 @@ async def _execute_confirmed_intent(
     logger.info(f"ADVISE: Executing confirmed intent - {pending_intent}")
 
     if pending_intent == "more_options":
-        return Command(
-            update={
-                "messages": [AIMessage(content="Starting a new search for more options...")],
-                "current_node": "advise",
-                "current_phase": "research",
-                "need_new_search": True,
-                "advise_has_presented": False,
-                **clear_hitl_flags(),
-            },
+        return _advise_command(
+            _MORE_OPTIONS_MESSAGE,
+            phase="research",
             goto="research",
+            need_new_search=True,
+            advise_has_presented=False,
         )
     elif pending_intent == "new_fields":
         extracted_fields = pending_details.get("extracted_fields", []) if pending_details else []
-        return Command(
-            update={
-                "messages": [
-                    AIMessage(
-                        content=f"Adding {', '.join(extracted_fields) if extracted_fields else 'new fields'} to the comparison..."
-                    )
-                ],
-                "current_node": "advise",
-                "current_phase": "research",
-                "need_new_search": False,
-                "advise_has_presented": False,
-                "requested_fields": extracted_fields,
-                **clear_hitl_flags(),
-            },
+        return _advise_command(
+            f"Adding {', '.join(extracted_fields) if extracted_fields else 'new fields'} to the comparison...",
+            phase="research",
             goto="research",
+            need_new_search=False,
+            advise_has_presented=False,
+            requested_fields=extracted_fields,
         )
     elif pending_intent == "change_requirements":
-        return Command(
-            update={
-                "messages": [
-                    AIMessage(
-                        content="Let's update your requirements. What would you like to change?"
-                    )
-                ],
-                "current_node": "advise",
-                "current_phase": "intake",
-                "advise_has_presented": False,
-                **clear_hitl_flags(),
-            },
+        return _advise_command(
+            _CHANGE_REQUIREMENTS_MESSAGE,
+            phase="intake",
             goto="intake",
+            advise_has_presented=False,
         )
     else:
         # Fallback
-        return Command(
-            update={
-                "messages": [
-                    AIMessage(content="I'm not sure what action to take. Can you clarify?")
-                ],
-                "current_node": "advise",
-                "current_phase": "advise",
-                **clear_hitl_flags(),
-            },
-            goto="__end__",
-        )
+        return _advise_command(_UNKNOWN_INTENT_MESSAGE)
 
 
 async def advise_node(state: AgentState) -> Command:
@@ -193,7 +580,9 @@ async def advise_node(state: AgentState) -> Command:
     # Check for HITL action at start
     if messages:
         last_message = messages[-1]
-        if hasattr(last_message, "content") and last_message.content.startswith("[HITL:intent:"):
+        if hasattr(last_message, "content") and last_message.content.startswith(
+            _HITL_INTENT_PREFIX
+        ):
             choice = parse_hitl_choice(last_message.content)
             logger.info(f"ADVISE: HITL action received - {choice}")
 
@@ -206,24 +595,12 @@ async def advise_node(state: AgentState) -> Command:
             else:
                 # User wants to clarify
                 logger.info("ADVISE: User wants to clarify")
-                return Command(
-                    update={
-                        "messages": [
-                            AIMessage(
-                                content="No problem! Please tell me more about what you'd like to do."
-                            )
-                        ],
-                        "current_node": "advise",
-                        "current_phase": "advise",
-                        **clear_hitl_flags(),
-                    },
-                    goto="__end__",
-                )
+                return _advise_command(_CLARIFY_MESSAGE)
 
     # Check if awaiting confirmation but user typed something instead
     if awaiting_intent and messages:
         last_message = messages[-1]
-        if hasattr(last_message, "content") and not last_message.content.startswith("[HITL:"):
+        if hasattr(last_message, "content") and not last_message.content.startswith(HITL_PREFIX):
             # User typed instead of clicking - treat as clarification
             logger.info(
                 "ADVISE: User provided text while awaiting intent confirmation - treating as clarification"
@@ -231,56 +608,25 @@ async def advise_node(state: AgentState) -> Command:
             # Clear HITL flags and continue with normal intent detection
             # Fall through to normal processing below
 
+    response_task = None
     try:
         llm_service = get_llm_service()
 
         # Build context with actual comparison data
-        # Prefer living_table if available, fall back to legacy comparison_table
         table_context = ""
         living_table_data = state.get("living_table")
-
         if living_table_data:
-            # Use the new living table format
-            living_table = ComparisonTable.model_validate(living_table_data)
-            field_names = living_table.get_field_names(exclude_internal=True)
-
-            # Build candidates data from living table - include more for comparative insights
-            all_candidates = []
-            for row in living_table.rows.values():
-                candidate_data = {
-                    "name": row.candidate.name,
-                    "manufacturer": row.candidate.manufacturer,
-                }
-                # Add enriched field values
-                for field_name in field_names:
-                    cell = row.cells.get(field_name)
-                    if cell and cell.value is not None:
-                        candidate_data[field_name] = cell.value
-                all_candidates.append(candidate_data)
-
-            # Provide top 5 for main recommendation + additional products for comparative insights
-            table_data = {
-                "total_candidates": living_table.get_row_count(),
-                "qualified_candidates": len(living_table.get_qualified_rows()),
-                "fields": field_names,
-                "top_5_products": all_candidates[:5],
-                "additional_products": all_candidates[
-                    5:15
-                ],  # Next 10 for "stretch budget", "best value" insights
-            }
-
-            table_context = f"\n\nComparison Table Data:\n{json.dumps(table_data, indent=2, ensure_ascii=False)}"
-
-            # Also include markdown table for easy reference (top 5 only)
-            markdown_table = living_table.to_markdown(max_rows=5)
-            table_context += f"\n\nTable Preview (top 5):\n{markdown_table}"
+            table_context = _get_table_context(living_table_data)
 
         # Add requirements context
         requirements_context = ""
         if requirements:
-            requirements_context = (
-                f"\n\nUser Requirements:\n{json.dumps(requirements, indent=2, ensure_ascii=False)}"
-            )
+            requirements_context = f"\n\nUser Requirements:\n{_dumps(requirements)}"
+
+        # Shared by every response generated below. Kept apart from the static
+        # ADVISE_SYSTEM_PROMPT so the provider can cache the prompt prefix
+        system_context = table_context + requirements_context
+        recent_messages = _recent_messages(messages)
 
         # -------------------------------------------------------------------
         # First entry: Present results and wait for user input
@@ -289,77 +635,82 @@ async def advise_node(state: AgentState) -> Command:
             logger.info("ADVISE: First entry - presenting results")
 
             # Generate presentation of results
-            llm_response = await llm_service.generate(
-                messages,
-                system_prompt=ADVISE_SYSTEM_PROMPT + table_context + requirements_context,
-            )
+            response_content = await _stream_response(llm_service, recent_messages, system_context)
 
-            return Command(
-                update={
-                    "messages": [AIMessage(content=llm_response.content)],
-                    "current_node": "advise",
-                    "current_phase": "advise",
-                    "advise_has_presented": True,
-                    **clear_hitl_flags(),
-                },
-                goto="__end__",  # Wait for user input
-            )
+            # Wait for user input
+            return _advise_command(response_content, advise_has_presented=True)
 
         # -------------------------------------------------------------------
         # Subsequent entry: User sent a new message, analyze intent
         # -------------------------------------------------------------------
         logger.info("ADVISE: Analyzing user intent")
 
-        # Get the user's latest message
-        last_user_message = None
-        for msg in reversed(messages):
-            if hasattr(msg, "type") and msg.type == "human":
-                # Skip HITL synthetic messages
-                if not msg.content.startswith("[HITL:"):
-                    last_user_message = msg.content
-                    break
+        # Get the user's latest message, recorded on input by the workflow.
+        # States built without it (e.g. directly in tests) fall back to a scan
+        # that skips HITL synthetic messages.
+        last_user_message = state.get("last_user_message") or next(
+            (
+                msg.content
+                for msg in reversed(messages)
+                if getattr(msg, "type", None) == "human" and not msg.content.startswith(HITL_PREFIX)
+            ),
+            None,
+        )
 
         if not last_user_message:
             # Edge case: no user message found, just respond
             logger.warning("ADVISE: No user message found, generating response")
-            llm_response = await llm_service.generate(
-                messages,
-                system_prompt=ADVISE_SYSTEM_PROMPT + table_context + requirements_context,
+            response_content = await _stream_response(llm_service, recent_messages, system_context)
+            return _advise_command(response_content)
+
+        # Detect user intent, falling back to the LLM when keywords and earlier
+        # classifications don't settle it
+        matched_intent = _match_intent(last_user_message)
+        matched_fields = _match_add_fields(last_user_message)
+        intent_cache_key = _intent_cache_key(last_user_message, recent_messages)
+        cached_intent = _intent_cache.get(intent_cache_key)
+        if matched_intent:
+            user_intent = UserIntent(
+                intent_type=matched_intent,
+                reasoning="Matched intent keywords in user message",
             )
-            return Command(
-                update={
-                    "messages": [AIMessage(content=llm_response.content)],
-                    "current_node": "advise",
-                    "current_phase": "advise",
-                    **clear_hitl_flags(),
-                },
-                goto="__end__",
+        elif matched_fields:
+            user_intent = UserIntent(
+                intent_type="new_fields",
+                reasoning="Matched a request to add fields in user message",
+                extracted_fields=matched_fields,
             )
+        elif cached_intent:
+            user_intent = cached_intent.model_copy(deep=True)
+        else:
+            intent_prompt = INTENT_PROMPT_TEMPLATE.format(user_message=last_user_message)
 
-        # Detect user intent
-        intent_prompt = f"""Analyze the user's last message to determine their intent.
-
-User's message: "{last_user_message}"
-
-Current phase: We have presented product recommendations and the user is now responding.
-
-Possible intents:
-- 'satisfied': User is done and happy with results (e.g., "thanks", "I'll go with this", "that's all")
-- 'more_options': User wants to see more products (e.g., "show me more", "any other options?")
-- 'new_fields': User wants to add comparison dimensions (e.g., "can you add energy efficiency?", "compare warranty")
-- 'change_requirements': User wants to modify search criteria (e.g., "actually my budget is £30", "I want a different brand")
-- 'question': User is asking a follow-up question about current results
-
-What is their primary intent?"""
+            intent_messages = [*recent_messages, HumanMessage(content=intent_prompt)]
 
-        intent_messages = messages.copy()
-        intent_messages.append(HumanMessage(content=intent_prompt))
+            # Start the reply while classifying: satisfied and question intents answer
+            # with exactly this response, and it is cancelled for the other intents
+            release_response = asyncio.Event()
+            response_task = asyncio.create_task(
+                _stream_response(
+                    llm_service, recent_messages, system_context, release=release_response
+                )
+            )
 
-        user_intent = await llm_service.generate_structured(
-            intent_messages,
-            schema=UserIntent,
-            system_prompt=ADVISE_SYSTEM_PROMPT,
-        )
+            try:
+                user_intent = await llm_service.generate_structured(
+                    intent_messages,
+                    schema=UserIntent,
+                    system_prompt=ADVISE_SYSTEM_PROMPT,
+                )
+                _cache_intent(intent_cache_key, user_intent)
+            except Exception:
+                # The reply is already being generated, so answer with it rather
+                # than failing the turn over the classifier alone
+                logger.warning("ADVISE: Intent classification failed, answering directly")
+                user_intent = UserIntent(
+                    intent_type="question",
+                    reasoning="Intent classification failed",
+                )
 
         logger.info(
             f"Detected intent: {user_intent.intent_type}, reasoning: {user_intent.reasoning}"
@@ -376,65 +727,53 @@ What is their primary intent?"""
 
             logger.info(f"ADVISE: Intent requires confirmation - {user_intent.intent_type}")
 
-            return Command(
-                update={
-                    "messages": [AIMessage(content=confirmation_message)],
-                    "current_node": "advise",
-                    "current_phase": "advise",
-                    "awaiting_intent_confirmation": True,
-                    "pending_intent": user_intent.intent_type,
-                    "pending_intent_details": {"extracted_fields": user_intent.extracted_fields},
-                    "action_choices": ["Yes, proceed", "No, let me clarify"],
-                },
-                goto="__end__",  # Wait for HITL confirmation
+            if response_task:
+                response_task.cancel()
+
+            # Wait for HITL confirmation
+            return _advise_command(
+                confirmation_message,
+                awaiting_intent_confirmation=True,
+                pending_intent=user_intent.intent_type,
+                pending_intent_details={"extracted_fields": user_intent.extracted_fields},
+                action_choices=["Yes, proceed", "No, let me clarify"],
             )
 
         # For satisfied and question intents, no confirmation needed
         if user_intent.intent_type == "satisfied":
             logger.info("User satisfied, ending session")
 
-            # Generate a farewell response
-            llm_response = await llm_service.generate(
-                messages,
-                system_prompt=ADVISE_SYSTEM_PROMPT + table_context + requirements_context,
-            )
+            # Only a message that is nothing but a sign-off gets the fixed farewell;
+            # anything else may carry a request the reply should answer
+            if _is_sign_off(last_user_message):
+                if response_task:
+                    response_task.cancel()
+                response_content = _FAREWELL_MESSAGE
+            elif response_task:
+                release_response.set()
+                response_content = await response_task
+            else:
+                response_content = await _stream_response(
+                    llm_service, recent_messages, system_context
+                )
 
-            return Command(
-                update={
-                    "messages": [AIMessage(content=llm_response.content)],
-                    "current_node": "advise",
-                    "current_phase": "complete",
-                    **clear_hitl_flags(),
-                },
-                goto="__end__",
-            )
+            return _advise_command(response_content, phase="complete")
         else:
             # Question or uncertain - continue conversation
             logger.info("Continuing conversation in ADVISE")
 
-            llm_response = await llm_service.generate(
-                messages,
-                system_prompt=ADVISE_SYSTEM_PROMPT + table_context + requirements_context,
-            )
+            if response_task:
+                release_response.set()
+                response_content = await response_task
+            else:
+                response_content = await _stream_response(
+                    llm_service, recent_messages, system_context
+                )
 
-            return Command(
-                update={
-                    "messages": [AIMessage(content=llm_response.content)],
-                    "current_node": "advise",
-                    "current_phase": "advise",
-                    **clear_hitl_flags(),
-                },
-                goto="__end__",
-            )
+            return _advise_command(response_content)
 
     except Exception:
         logger.exception("ADVISE error")
-        return Command(
-            update={
-                "messages": [AIMessage(content="I encountered an error processing your request.")],
-                "current_node": "advise",
-                "current_phase": "error",
-                **clear_hitl_flags(),
-            },
-            goto="__end__",
-        )
+        if response_task:
+            response_task.cancel()
+        return _advise_command(_ERROR_MESSAGE, phase="error")
@@ -1,32 +1,92 @@
 """INTAKE node - Gather requirements through conversation."""
 
+import asyncio
+import hashlib
+from collections.abc import Iterator
+from functools import lru_cache
 from pathlib import Path
 
-import yaml
-from langchain_core.messages import AIMessage, HumanMessage
+import orjson
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langgraph.config import get_stream_writer
 from langgraph.types import Command
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.models.state import AgentState
-from app.services.llm import get_intake_chat_llm_service, get_intake_llm_service
-from app.utils.hitl import clear_hitl_flags, parse_hitl_choice
+from app.services.llm import LLMService, get_intake_chat_llm_service, get_intake_llm_service
+from app.utils.hitl import CLEARED_HITL_FLAGS, parse_hitl_choice
 from app.utils.logger import get_logger
+from app.utils.yaml_loader import load_yaml
 
 logger = get_logger(__name__)
 
-# Load prompt from YAML
 PROMPTS_DIR = Path(__file__).parent / "prompts"
 INTAKE_PROMPT_PATH = PROMPTS_DIR / "intake.yaml"
 
-with open(INTAKE_PROMPT_PATH) as f:
-    INTAKE_PROMPTS = yaml.safe_load(f)
 
-INTAKE_SYSTEM_PROMPT = INTAKE_PROMPTS["system_prompt"]
+@lru_cache(maxsize=1)
+def get_intake_system_prompt() -> str:
+    """Load the intake system prompt from YAML on first use."""
+    return load_yaml(INTAKE_PROMPT_PATH)["system_prompt"]
+
+
+REQUIREMENTS_PROMPT = """Based on the entire conversation so far, extract the user's product requirements.
+
+Update any previous requirements with new information from the latest messages.
+If something hasn't been mentioned, leave it as None or empty list."""
+
+DECISION_PROMPT_TEMPLATE = """Analyze the user's last message and generate an appropriate response.
+
+Requirements gathered before the user's last message:
+{requirements}
+
+Your task:
+1. If the user asked a question (e.g., "What is OLED?", "What's the difference between..."), answer it educationally with practical trade-offs.
+2. If the user provided new information, acknowledge it and either:
+   - Suggest a relevant consideration they might not have thought about (e.g., "Have you considered panel type?" for TVs)
+   - Ask a clarifying question that would meaningfully affect their choice
+3. If the user explicitly wants to search ("show me options", "let's search", "I'm ready"), set user_ready_to_search to true.
+
+Be a knowledgeable consultant—proactively helpful, not just reactive. Don't ask multiple questions at once."""
+
+# Whole replies that only ask to start the search. They add no requirements, so
+# once the product type is known both LLM calls can be skipped.
+_READY_TO_SEARCH_REPLIES = frozenset(
+    {
+        "search",
+        "search now",
+        "let's search",
+        "lets search",
+        "start the search",
+        "start searching",
+        "show me options",
+        "show me some options",
+        "i'm ready",
+        "im ready",
+        "ready to search",
+    }
+)
+
+# Conversation turns sent to the LLM; requirements gathered from older turns are
+# carried forward in the prompts, so the full history isn't needed
+MAX_INTAKE_MESSAGES = 20
+
+# Seconds to wait for the extraction and reply before asking the user to retry,
+# so a stalled provider doesn't hold the turn open indefinitely
+INTAKE_LLM_TIMEOUT = 30.0
+
+# Extraction and decision results per conversation, for repeats of an identical
+# conversation (typically a first message many users type the same way)
+INTAKE_CACHE_SIZE = 256
+_intake_cache: dict[str, tuple["UserRequirements", "IntakeDecision"]] = {}
 
 
 class UserRequirements(BaseModel):
     """Structured user requirements extracted from conversation."""
 
+    # Read-only, since cached results are shared between turns
+    model_config = ConfigDict(frozen=True)
+
     product_type: str | None = Field(
         None,
         description="The type/category of product the user wants (e.g., 'electric kettle', 'laptop', 'sports car')",
@@ -58,6 +118,8 @@ class UserRequirements(BaseModel):
 class IntakeDecision(BaseModel):
     """Decision about how to continue the intake conversation."""
 
+    model_config = ConfigDict(frozen=True)
+
     user_asked_question: bool = Field(
         default=False,
         description="True if the user's last message was asking for information/clarification (e.g., 'What is OLED?', 'What's the difference between...')",
@@ -75,6 +137,16 @@ class IntakeDecision(BaseModel):
     )
 
 
+# List requirements shown in the HITL summary, in display order
+_SUMMARY_LIST_LABELS = (
+    ("must_haves", "Must have"),
+    ("nice_to_haves", "Nice to have"),
+    ("priorities", "Priorities"),
+    ("specifications", "Specifications"),
+    ("constraints", "Avoid"),
+)
+
+
 def format_requirements_summary(requirements: dict) -> str:
     """
     Format requirements into a human-readable summary for HITL confirmation.
@@ -85,42 +157,121 @@ def format_requirements_summary(requirements: dict) -> str:
     Returns:
         Formatted summary string
     """
-    parts = []
+    return (
+        "\n".join(_requirements_summary_lines(requirements)) or "No specific requirements captured."
+    )
+
 
+def _requirements_summary_lines(requirements: dict) -> Iterator[str]:
+    """Yield one summary line for each requirement that has been captured."""
     product_type = requirements.get("product_type")
     if product_type:
-        parts.append(f"**Product:** {product_type}")
+        yield f"**Product:** {product_type}"
 
     budget_min = requirements.get("budget_min")
     budget_max = requirements.get("budget_max")
     if budget_min and budget_max:
-        parts.append(f"**Budget:** ${budget_min} - ${budget_max}")
+        yield f"**Budget:** ${budget_min} - ${budget_max}"
     elif budget_max:
-        parts.append(f"**Budget:** Under ${budget_max}")
+        yield f"**Budget:** Under ${budget_max}"
     elif budget_min:
-        parts.append(f"**Budget:** Over ${budget_min}")
+        yield f"**Budget:** Over ${budget_min}"
 
-    must_haves = requirements.get("must_haves", [])
-    if must_haves:
-        parts.append(f"**Must have:** {', '.join(must_haves)}")
+    for key, label in _SUMMARY_LIST_LABELS:
+        values = requirements.get(key)
+        if values:
+            yield f"**{label}:** {', '.join(values)}"
 
-    nice_to_haves = requirements.get("nice_to_haves", [])
-    if nice_to_haves:
-        parts.append(f"**Nice to have:** {', '.join(nice_to_haves)}")
 
-    priorities = requirements.get("priorities", [])
-    if priorities:
-        parts.append(f"**Priorities:** {', '.join(priorities)}")
+def format_requirements_context(requirements: dict) -> str:
+    """
+    Format requirements as "key: value" lines for inclusion in an LLM prompt.
+
+    Requirements are a flat dict of scalars and lists of strings, so a direct
+    formatter replaces yaml.dump, which runs twice on every INTAKE turn.
+
+    Args:
+        requirements: User requirements dict
+
+    Returns:
+        One line per requirement, with list values comma-separated
+    """
+    lines = []
+    for key, value in requirements.items():
+        if isinstance(value, list):
+            value = ", ".join(map(str, value)) or "none"
+        lines.append(f"{key}: {value}")
+    return "\n".join(lines)
+
+
+def _recent_messages(messages: list[BaseMessage]) -> list[BaseMessage]:
+    """
+    Get the tail of the conversation to send to the LLM, starting at a user turn.
 
-    specifications = requirements.get("specifications", [])
-    if specifications:
-        parts.append(f"**Specifications:** {', '.join(specifications)}")
+    Args:
+        messages: Full conversation history
+
+    Returns:
+        At most MAX_INTAKE_MESSAGES of the latest messages
+    """
+    recent = messages[-MAX_INTAKE_MESSAGES:]
+    start = next((i for i, msg in enumerate(recent) if msg.type == "human"), 0)
+    return recent[start:]
+
+
+def _intake_cache_key(messages: list, requirements: dict) -> str:
+    """Hash the conversation and requirements that an INTAKE turn is derived from."""
+    payload = [[[msg.type, msg.content] for msg in messages], requirements]
+    return hashlib.blake2b(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def _start_research(requirements: dict) -> Command:
+    """Build the Command that hands the gathered requirements over to RESEARCH."""
+    return Command(
+        update={
+            "messages": [AIMessage(content="Starting the search now...")],
+            "current_node": "intake",
+            "current_phase": "research",
+            "user_requirements": requirements,
+            **CLEARED_HITL_FLAGS,
+        },
+        goto="research",
+    )
 
-    constraints = requirements.get("constraints", [])
-    if constraints:
-        parts.append(f"**Avoid:** {', '.join(constraints)}")
 
-    return "\n".join(parts) if parts else "No specific requirements captured."
+async def _stream_decision(
+    llm_service: LLMService, messages: list[BaseMessage], system_prompt: str
+) -> IntakeDecision:
+    """
+    Decide the reply, emitting its response text on the graph's custom stream as it arrives.
+
+    The response is not streamed once the decision says the user is ready to
+    search, since the reply is then replaced with the search notice. Tokens are
+    only delivered when the workflow is run with stream_mode="custom".
+
+    Args:
+        llm_service: LLM service to generate the decision with
+        messages: Conversation history ending with the decision prompt
+        system_prompt: INTAKE system prompt
+
+    Returns:
+        The complete decision
+    """
+    writer = get_stream_writer()
+    decision = None
+    emitted = 0
+    # IntakeDecision declares user_ready_to_search before response, so the flag
+    # is already known by the time response text arrives
+    async for decision in llm_service.stream_structured(
+        messages, schema=IntakeDecision, system_prompt=system_prompt
+    ):
+        if not decision.user_ready_to_search and len(decision.response) > emitted:
+            writer({"token": decision.response[emitted:]})
+            emitted = len(decision.response)
+
+    if decision is None:
+        raise ValueError("No INTAKE decision was generated")
+    return decision
 
 
 async def intake_node(state: AgentState) -> Command:
@@ -158,16 +309,7 @@ async def intake_node(state: AgentState) -> Command:
             if choice in ("Search Now", "Ready to Search"):
                 # User confirmed, proceed to research
                 logger.info("INTAKE: User confirmed, transitioning to RESEARCH")
-                return Command(
-                    update={
-                        "messages": [AIMessage(content="Starting the search now...")],
-                        "current_node": "intake",
-                        "current_phase": "research",
-                        "user_requirements": current_requirements,
-                        **clear_hitl_flags(),
-                    },
-                    goto="research",
-                )
+                return _start_research(current_requirements)
             else:
                 # User wants to continue refining (shouldn't happen with current UI, but handle gracefully)
                 logger.info("INTAKE: User wants to continue refining")
@@ -180,73 +322,78 @@ async def intake_node(state: AgentState) -> Command:
                         ],
                         "current_node": "intake",
                         "current_phase": "intake",
-                        **clear_hitl_flags(),
+                        **CLEARED_HITL_FLAGS,
                     },
                     goto="__end__",
                 )
 
+        # Fast path: a plain request to search needs no extraction or reply
+        if (
+            last_message.type == "human"
+            and current_requirements.get("product_type")
+            and last_message.content.strip().rstrip("!.").lower() in _READY_TO_SEARCH_REPLIES
+        ):
+            logger.info("INTAKE: Search requested, transitioning to RESEARCH")
+            return _start_research(current_requirements)
+
     try:
+        intake_system_prompt = get_intake_system_prompt()
+
         # Use GPT-4.1 for requirement extraction (better at nuanced understanding)
         intake_llm = get_intake_llm_service()
         # Use GPT-4.1-mini for fast, snappy conversational responses
         chat_llm = get_intake_chat_llm_service()
 
-        # Step 1: Extract requirements from conversation using structured output
-        requirements_prompt = """Based on the entire conversation so far, extract the user's product requirements.
-
-Update any previous requirements with new information from the latest messages.
-If something hasn't been mentioned, leave it as None or empty list."""
-
-        if current_requirements:
-            requirements_prompt += f"\n\nPrevious requirements:\n{yaml.dump(current_requirements, default_flow_style=False)}"
-
-        requirements_messages = messages.copy()
-        requirements_messages.append(HumanMessage(content=requirements_prompt))
-
-        extracted_requirements = await intake_llm.generate_structured(
-            requirements_messages,
-            schema=UserRequirements,
-            system_prompt=INTAKE_SYSTEM_PROMPT,
+        # Extract requirements and decide the reply concurrently, streaming the
+        # reply as it is decided. The reply model sees the recent conversation,
+        # so it only needs the requirements gathered before the latest message
+        # rather than waiting for the extraction.
+        requirements_context = format_requirements_context(current_requirements)
+        requirements_prompt = REQUIREMENTS_PROMPT
+        if requirements_context:
+            requirements_prompt += f"\n\nPrevious requirements:\n{requirements_context}"
+        decision_prompt = DECISION_PROMPT_TEMPLATE.format(
+            requirements=requirements_context or "none yet"
         )
 
-        # Convert to dict and merge with current requirements
-        updated_requirements = extracted_requirements.model_dump(exclude_none=True)
-
-        # Merge lists properly (don't overwrite with empty lists)
-        for key in ["must_haves", "nice_to_haves", "priorities", "specifications", "constraints"]:
-            if key in current_requirements and current_requirements[key]:
-                if key not in updated_requirements or not updated_requirements[key]:
-                    updated_requirements[key] = current_requirements[key]
+        recent_messages = _recent_messages(messages)
+        cache_key = _intake_cache_key(recent_messages, current_requirements)
+        cached = _intake_cache.get(cache_key)
+        if cached:
+            logger.info("INTAKE: Reusing results for an identical conversation")
+            extracted_requirements, decision = cached
+        else:
+            async with asyncio.timeout(INTAKE_LLM_TIMEOUT):
+                extracted_requirements, decision = await asyncio.gather(
+                    intake_llm.generate_structured(
+                        [*recent_messages, HumanMessage(content=requirements_prompt)],
+                        schema=UserRequirements,
+                        system_prompt=intake_system_prompt,
+                    ),
+                    _stream_decision(
+                        chat_llm,
+                        [*recent_messages, HumanMessage(content=decision_prompt)],
+                        intake_system_prompt,
+                    ),
+                )
+            if len(_intake_cache) >= INTAKE_CACHE_SIZE:
+                # Evict the oldest entry; dicts keep insertion order
+                del _intake_cache[next(iter(_intake_cache))]
+            _intake_cache[cache_key] = (extracted_requirements, decision)
+
+        # Merge with current requirements. Unset fields and empty lists are left
+        # out of the dump, so they keep their previous values rather than
+        # overwriting them.
+        updated_requirements = {
+            **current_requirements,
+            **extracted_requirements.model_dump(exclude_none=True, exclude_defaults=True),
+        }
 
         logger.info(f"Extracted requirements: {updated_requirements}")
 
-        # Step 2: Generate conversational response with contextual suggestions
         # Check if we have minimum viable requirements (product type known)
         has_product_type = bool(updated_requirements.get("product_type"))
 
-        decision_prompt = f"""Analyze the user's last message and generate an appropriate response.
-
-Current requirements:
-{yaml.dump(updated_requirements, default_flow_style=False)}
-
-Your task:
-1. If the user asked a question (e.g., "What is OLED?", "What's the difference between..."), answer it educationally with practical trade-offs.
-2. If the user provided new information, acknowledge it and either:
-   - Suggest a relevant consideration they might not have thought about (e.g., "Have you considered panel type?" for TVs)
-   - Ask a clarifying question that would meaningfully affect their choice
-3. If the user explicitly wants to search ("show me options", "let's search", "I'm ready"), set user_ready_to_search to true.
-
-Be a knowledgeable consultant—proactively helpful, not just reactive. Don't ask multiple questions at once."""
-
-        decision_messages = messages.copy()
-        decision_messages.append(HumanMessage(content=decision_prompt))
-
-        decision = await chat_llm.generate_structured(
-            decision_messages,
-            schema=IntakeDecision,
-            system_prompt=INTAKE_SYSTEM_PROMPT,
-        )
-
         logger.info(
             f"Decision: user_ready={decision.user_ready_to_search}, asked_question={decision.user_asked_question}"
         )
@@ -254,16 +401,7 @@ Be a knowledgeable consultant—proactively helpful, not just reactive. Don't as
         # If user explicitly wants to search, proceed to research
         if decision.user_ready_to_search:
             logger.info("INTAKE: User ready to search, transitioning to RESEARCH")
-            return Command(
-                update={
-                    "messages": [AIMessage(content="Starting the search now...")],
-                    "current_node": "intake",
-                    "current_phase": "research",
-                    "user_requirements": updated_requirements,
-                    **clear_hitl_flags(),
-                },
-                goto="research",
-            )
+            return _start_research(updated_requirements)
 
         # Build response - continue conversational intake
         response_content = decision.response
@@ -296,6 +434,21 @@ Be a knowledgeable consultant—proactively helpful, not just reactive. Don't as
                 goto="__end__",
             )
 
+    except TimeoutError:
+        logger.warning(f"INTAKE: LLM calls timed out after {INTAKE_LLM_TIMEOUT}s")
+        return Command(
+            update={
+                "messages": [
+                    AIMessage(
+                        content="Sorry, that took longer than expected. Could you send your message again?"
+                    )
+                ],
+                "current_node": "intake",
+                "current_phase": "intake",
+            },
+            goto="__end__",
+        )
+
     except Exception:
         logger.exception("INTAKE error")
         return Command(
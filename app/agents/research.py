@@ -12,7 +12,7 @@ from app.agents.research_table import (
 )
 from app.models.schemas.shortlist import FieldDefinition
 from app.models.state import AgentState
-from app.utils.hitl import clear_hitl_flags, parse_hitl_choice
+from app.utils.hitl import CLEARED_HITL_FLAGS, parse_hitl_choice
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -131,7 +131,7 @@ async def research_node(state: AgentState) -> Command:
                             ],
                             "current_node": "research",
                             "current_phase": "research",
-                            **clear_hitl_flags(),
+                            **CLEARED_HITL_FLAGS,
                         },
                         goto="research",
                     )
@@ -158,7 +158,7 @@ async def research_node(state: AgentState) -> Command:
                     living_table = await enrich_living_table(living_table)
 
                     num_candidates = living_table.get_row_count()
-                    qualified = len(living_table.get_qualified_rows())
+                    qualified = living_table.get_qualified_count()
                     response_msg = (
                         f"Research complete! I found {qualified} products that match your requirements "
                         f"(out of {num_candidates} analyzed)."
@@ -175,7 +175,7 @@ async def research_node(state: AgentState) -> Command:
                             "requested_fields": [],  # Clear after processing
                             "advise_has_presented": False,
                             "messages": [AIMessage(content=response_msg)],
-                            **clear_hitl_flags(),
+                            **CLEARED_HITL_FLAGS,
                         },
                         goto="advise",
                     )
@@ -188,7 +188,7 @@ async def research_node(state: AgentState) -> Command:
                             ],
                             "current_node": "research",
                             "current_phase": "error",
-                            **clear_hitl_flags(),
+                            **CLEARED_HITL_FLAGS,
                         },
                         goto="advise",
                     )
@@ -204,7 +204,7 @@ async def research_node(state: AgentState) -> Command:
                         ],
                         "current_node": "research",
                         "current_phase": "research",
-                        **clear_hitl_flags(),
+                        **CLEARED_HITL_FLAGS,
                     },
                     goto="__end__",
                 )
@@ -250,7 +250,7 @@ async def research_node(state: AgentState) -> Command:
                             "requested_fields": [],
                             "advise_has_presented": False,
                             "messages": [AIMessage(content=response_msg)],
-                            **clear_hitl_flags(),
+                            **CLEARED_HITL_FLAGS,
                         },
                         goto="advise",
                     )
@@ -281,7 +281,7 @@ async def research_node(state: AgentState) -> Command:
                         "current_phase": "research",
                         "need_new_search": True,
                         "requested_fields": [],
-                        **clear_hitl_flags(),
+                        **CLEARED_HITL_FLAGS,
                     },
                     goto="research",
                 )
@@ -301,7 +301,7 @@ async def research_node(state: AgentState) -> Command:
                         "current_node": "research",
                         "current_phase": "advise",
                         "requested_fields": [],
-                        **clear_hitl_flags(),
+                        **CLEARED_HITL_FLAGS,
                     },
                     goto="advise",
                 )
@@ -328,7 +328,7 @@ async def research_node(state: AgentState) -> Command:
                     "requested_fields": [],  # Clear after processing
                     "advise_has_presented": False,
                     "messages": [AIMessage(content=response_msg)],
-                    **clear_hitl_flags(),
+                    **CLEARED_HITL_FLAGS,
                 },
                 goto="advise",
             )
@@ -378,7 +378,7 @@ async def research_node(state: AgentState) -> Command:
                     "current_node": "research",
                     "current_phase": "research",
                     "need_new_search": True,
-                    **clear_hitl_flags(),
+                    **CLEARED_HITL_FLAGS,
                 },
                 goto="research",
             )
@@ -401,7 +401,7 @@ async def research_node(state: AgentState) -> Command:
                 "requested_fields": [],
                 "advise_has_presented": False,
                 "messages": [AIMessage(content=response_msg)],
-                **clear_hitl_flags(),
+                **CLEARED_HITL_FLAGS,
             },
             goto="advise",
         )
@@ -414,7 +414,7 @@ async def research_node(state: AgentState) -> Command:
                 "current_node": "research",
                 "current_phase": "error",
                 "messages": [AIMessage(content=error_msg)],
-                **clear_hitl_flags(),
+                **CLEARED_HITL_FLAGS,
             },
             goto="advise",  # Still proceed to ADVISE with error context
         )
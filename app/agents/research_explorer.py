@@ -4,8 +4,6 @@ import asyncio
 import json
 from pathlib import Path
 
-import yaml
-
 from app.config.settings import get_settings
 from app.models.schemas.shortlist import SearchQuery, SearchQueryPlan
 from app.models.state import AgentState
@@ -14,6 +12,7 @@ from app.services.llm import LLMService, get_llm_service
 from app.services.search_strategy import get_search_strategy_service
 from app.utils.logger import get_logger
 from app.utils.retry import web_search_retry
+from app.utils.yaml_loader import load_yaml
 
 logger = get_logger(__name__)
 
@@ -21,8 +20,7 @@ logger = get_logger(__name__)
 PROMPTS_DIR = Path(__file__).parent / "prompts"
 EXPLORER_PROMPT_PATH = PROMPTS_DIR / "explorer.yaml"
 
-with open(EXPLORER_PROMPT_PATH) as f:
-    EXPLORER_PROMPTS = yaml.safe_load(f)
+EXPLORER_PROMPTS = load_yaml(EXPLORER_PROMPT_PATH)
 
 # System prompt for web search to extract product candidates
 SEARCH_SYSTEM_PROMPT = """You are a product researcher. Search for products matching the query.
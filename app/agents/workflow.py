@@ -1,5 +1,7 @@
 """LangGraph workflow definition and orchestration."""
 
+from collections.abc import Awaitable, Callable
+
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import StateGraph
 from langgraph.types import Command
@@ -9,6 +11,7 @@ from app.agents.intake import intake_node
 from app.agents.research import research_node
 from app.models.state import AgentState
 from app.services.llm import LLMService
+from app.utils.hitl import HITL_PREFIX
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -223,6 +226,7 @@ async def process_message_with_state(
     message: str,
     user_id: str,
     session_id: str,
+    on_token: Callable[[str], Awaitable[None]] | None = None,
 ) -> WorkflowResult:
     """
     Process a user message through the workflow and return full result.
@@ -232,6 +236,7 @@ async def process_message_with_state(
         message: User's message content
         user_id: User identifier
         session_id: Chat session identifier
+        on_token: Optional callback for response tokens streamed by nodes
 
     Returns:
         WorkflowResult with response content, citations, and sources
@@ -267,9 +272,23 @@ async def process_message_with_state(
         }
         logger.info(f"Continuing session {session_id}")
 
+    # HITL button clicks arrive as synthetic messages and are not user input
+    if not message.startswith(HITL_PREFIX):
+        input_state["last_user_message"] = message
+
     # Run workflow
     try:
-        result = await workflow.ainvoke(input_state, config)
+        if on_token:
+            result = {}
+            async for mode, chunk in workflow.astream(
+                input_state, config, stream_mode=["custom", "values"]
+            ):
+                if mode == "custom":
+                    await on_token(chunk["token"])
+                else:
+                    result = chunk
+        else:
+            result = await workflow.ainvoke(input_state, config)
 
         # Extract response from messages
         messages = result.get("messages", [])
@@ -14,6 +14,7 @@ from app.auth.password_auth import password_auth_callback
 from app.chat.citations import format_response_with_citations
 from app.chat.hitl_actions import remove_current_actions, render_action_buttons
 from app.chat.starters import STARTER_DIRECT_RESPONSES
+from app.chat.streaming import StreamedReply
 from app.chat.table_rendering import send_product_table
 from app.config import get_settings
 from app.services.llm import get_llm_service
@@ -204,16 +205,20 @@ async def on_message(message: cl.Message):
     user_id = user.identifier if user else "anonymous"
     session_id = cl.user_session.get("id", "unknown")
 
+    # Stream INTAKE and ADVISE replies into a message as tokens arrive
+    previous_phase = cl.user_session.get("previous_phase", "intake")
+    streamed_reply = StreamedReply(author=get_agent_name(previous_phase))
+
     # Process through workflow
     result = await process_message_with_state(
         workflow=workflow,
         message=sanitized_content,
         user_id=user_id,
         session_id=session_id,
+        on_token=streamed_reply.stream_token,
     )
 
     # Handle phase transition toast
-    previous_phase = cl.user_session.get("previous_phase", "intake")
     current_phase = result.current_phase
     await emit_phase_transition_toast(previous_phase, current_phase)
     cl.user_session.set("previous_phase", current_phase)
@@ -238,7 +243,9 @@ async def on_message(message: cl.Message):
 
     # Check if we need to render action buttons
     if result.action_choices:
-        await render_action_buttons(result, response_content, agent_name)
+        await render_action_buttons(result, response_content, agent_name, streamed_reply.message)
+    elif streamed_reply.message:
+        await streamed_reply.finalise(response_content, agent_name)
     else:
         await cl.Message(content=response_content, author=agent_name).send()
 
@@ -4,6 +4,7 @@ import chainlit as cl
 
 from app.agents.workflow import WorkflowResult, process_message_with_state
 from app.chat.citations import format_response_with_citations
+from app.chat.streaming import StreamedReply
 from app.chat.table_rendering import send_product_table
 from app.utils.logger import get_logger
 
@@ -11,7 +12,10 @@ logger = get_logger(__name__)
 
 
 async def render_action_buttons(
-    result: WorkflowResult, message_content: str, agent_name: str
+    result: WorkflowResult,
+    message_content: str,
+    agent_name: str,
+    message: cl.Message | None = None,
 ) -> None:
     """
     Render action buttons if the workflow result has action choices.
@@ -20,6 +24,8 @@ async def render_action_buttons(
         result: WorkflowResult containing potential HITL state
         message_content: The message content to display with buttons
         agent_name: The display name of the agent sending the message
+        message: Message the response was streamed into, if any, to attach
+            the buttons to instead of sending a new message
     """
     action_choices = result.action_choices
     if not action_choices:
@@ -51,7 +57,12 @@ async def render_action_buttons(
     cl.user_session.set("current_actions", actions)
 
     # Send message with action buttons
-    await cl.Message(content=message_content, actions=actions, author=agent_name).send()
+    if message is None:
+        message = cl.Message(content=message_content)
+    message.content = message_content
+    message.actions = actions
+    message.author = agent_name
+    await message.send()
 
 
 async def remove_current_actions() -> None:
@@ -105,6 +116,9 @@ async def on_hitl_action(action: cl.Action):
     except Exception as e:
         logger.warning(f"Failed to retrieve state for product name: {e}")
 
+    # Stream the ADVISE presentation as it is generated once research completes
+    streamed_reply = StreamedReply(author=get_agent_name("advise"))
+
     # Process through workflow with loading indicator (only for slow operations)
     if checkpoint == "requirements":
         step_name = f"Searching for {product_name}s..."
@@ -114,6 +128,7 @@ async def on_hitl_action(action: cl.Action):
                 message=synthetic_message,
                 user_id=user_id,
                 session_id=session_id,
+                on_token=streamed_reply.stream_token,
             )
     elif checkpoint == "fields":
         step_name = f"Analysing {product_name} specs..."
@@ -123,6 +138,7 @@ async def on_hitl_action(action: cl.Action):
                 message=synthetic_message,
                 user_id=user_id,
                 session_id=session_id,
+                on_token=streamed_reply.stream_token,
             )
     else:
         result = await process_message_with_state(
@@ -130,6 +146,7 @@ async def on_hitl_action(action: cl.Action):
             message=synthetic_message,
             user_id=user_id,
             session_id=session_id,
+            on_token=streamed_reply.stream_token,
         )
 
     # Handle phase transition toast
@@ -150,7 +167,9 @@ async def on_hitl_action(action: cl.Action):
 
     # Check if we need to render action buttons
     if result.action_choices:
-        await render_action_buttons(result, response_content, agent_name)
+        await render_action_buttons(result, response_content, agent_name, streamed_reply.message)
+    elif streamed_reply.message:
+        await streamed_reply.finalise(response_content, agent_name)
     else:
         await cl.Message(content=response_content, author=agent_name).send()
 
@@ -0,0 +1,49 @@
+"""Streaming of workflow response tokens into Chainlit messages."""
+
+import chainlit as cl
+
+
+class StreamedReply:
+    """
+    Chainlit message that response tokens are streamed into as they arrive.
+
+    The message is only created when the first token arrives, so turns that
+    stream nothing (HITL confirmations, cached replies) send their response
+    the usual way.
+
+    Usage:
+        reply = StreamedReply(author="Advisor")
+        result = await process_message_with_state(..., on_token=reply.stream_token)
+        if reply.message:
+            await reply.finalise(content, author)
+    """
+
+    def __init__(self, author: str):
+        """
+        Initialize the streamed reply.
+
+        Args:
+            author: Display name shown while the response streams
+        """
+        self.author = author
+        self.message: cl.Message | None = None
+
+    async def stream_token(self, token: str) -> None:
+        """Append a token to the message, creating it on the first token."""
+        if self.message is None:
+            self.message = cl.Message(content="", author=self.author)
+            # Stay top-level even when the workflow runs inside a loading step
+            self.message.parent_id = None
+        await self.message.stream_token(token)
+
+    async def finalise(self, content: str, author: str) -> None:
+        """
+        Replace the streamed text with the final formatted response.
+
+        Args:
+            content: Final response content (e.g. with citations appended)
+            author: Display name of the agent for the resulting phase
+        """
+        self.message.content = content
+        self.message.author = author
+        await self.message.send()
@@ -23,6 +23,9 @@ class Settings(BaseSettings):
     llm_provider: Literal["openai", "anthropic", "mock"] = "openai"
     llm_model: str = "gpt-4o-mini"
     llm_temperature: float = 0.7
+    # How structured output is requested: native tool calling (faster, fewer
+    # tokens) or the provider's JSON schema response format
+    structured_output_method: Literal["function_calling", "json_schema"] = "function_calling"
 
     # Intake-specific models
     # GPT-4.1 for requirement extraction (better nuanced understanding)
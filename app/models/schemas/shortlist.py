@@ -151,6 +151,25 @@ class ComparisonTable(BaseSchema):
         description="DEPRECATED: Use rows instead. Kept for migration.",
     )
 
+    @staticmethod
+    def version_key(table_data: dict[str, Any]) -> tuple:
+        """
+        Identify a serialized table's version without validating it.
+
+        Every mutation bumps last_modified, so the key changes whenever the table does.
+
+        Args:
+            table_data: Serialized ComparisonTable dict
+
+        Returns:
+            Hashable (created_at, last_modified, row count) key
+        """
+        return (
+            table_data.get("created_at"),
+            table_data.get("last_modified"),
+            len(table_data.get("rows", {})),
+        )
+
     def _normalize_name(self, name: str) -> str:
         """Normalize product name for deduplication comparison."""
         return name.lower().strip().replace("-", " ").replace("_", " ")
@@ -406,6 +425,10 @@ class ComparisonTable(BaseSchema):
         """Get rows that meet requirements."""
         return [row for row in self.rows.values() if row.meets_requirements is True]
 
+    def get_qualified_count(self) -> int:
+        """Get number of rows that meet requirements."""
+        return sum(1 for row in self.rows.values() if row.meets_requirements is True)
+
     def get_row_count(self) -> int:
         """Get total number of rows."""
         return len(self.rows)
@@ -109,6 +109,10 @@ class AgentState(TypedDict, total=False):
     # RESEARCH reads this to add only new fields without regenerating everything
     requested_fields: list[str]
 
+    # Latest user-typed message (HITL synthetic messages excluded)
+    # Set on input so ADVISE need not scan the message history for it
+    last_user_message: str | None
+
     # Track whether ADVISE has presented results to user
     # Used to distinguish first entry (present results) vs subsequent (analyze intent)
     advise_has_presented: bool
@@ -181,6 +185,7 @@ def create_initial_state(
         need_new_search=False,
         new_fields_to_add=[],
         requested_fields=[],
+        last_user_message=None,
         current_phase="intake",
         # HITL fields
         awaiting_requirements_confirmation=False,
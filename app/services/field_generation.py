@@ -2,12 +2,12 @@
 
 from pathlib import Path
 
-import yaml
 from langchain_core.messages import HumanMessage
 from pydantic import BaseModel, Field
 
 from app.services.llm import LLMService
 from app.utils.logger import get_logger
+from app.utils.yaml_loader import load_yaml
 
 logger = get_logger(__name__)
 
@@ -59,8 +59,7 @@ class FieldGenerationService:
     def _load_config(self) -> dict:
         """Load the field generation configuration."""
         try:
-            with open(FIELD_GEN_PATH) as f:
-                return yaml.safe_load(f)
+            return load_yaml(FIELD_GEN_PATH)
         except Exception as e:
             logger.error(f"Failed to load field generation config: {e}")
             return {}
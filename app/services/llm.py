@@ -1,9 +1,10 @@
 """LLM service abstraction layer."""
 
 import time
+from collections.abc import AsyncIterator
 from dataclasses import dataclass, field
 from functools import lru_cache
-from typing import NamedTuple
+from typing import Any, NamedTuple
 
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
 
@@ -23,7 +24,7 @@ class LLMResponse(NamedTuple):
     response_time: float
 
 
-@dataclass
+@dataclass(slots=True)
 class Citation:
     """A citation from web search results."""
 
@@ -81,6 +82,10 @@ class LLMService:
         self.model = settings.llm_model
         self.temperature = settings.llm_temperature
         self._client = None
+        # Structured-output runnables per schema; building one converts the schema
+        # to a tool definition, so it is done once rather than on every call
+        self._structured_clients: dict[type, Any] = {}
+        self._responses_client = None
 
         logger.info(f"LLM service initialized: {self.provider}/{self.model}")
 
@@ -91,6 +96,20 @@ class LLMService:
             self._client = self._create_client()
         return self._client
 
+    @property
+    def responses_client(self):
+        """
+        Lazy-load the OpenAI SDK client used for the Responses API.
+
+        Kept for the life of the service so concurrent and successive web search
+        calls share one connection pool instead of each opening new connections.
+        """
+        if self._responses_client is None:
+            from openai import AsyncOpenAI
+
+            self._responses_client = AsyncOpenAI(api_key=self.settings.openai_api_key)
+        return self._responses_client
+
     def _create_client(self):
         """Create the appropriate LLM client based on provider."""
         if self.provider == "openai":
@@ -117,10 +136,49 @@ class LLMService:
         else:
             raise ValueError(f"Unsupported LLM provider: {self.provider}")
 
+    def _prepare_messages(
+        self,
+        messages: list[BaseMessage],
+        system_prompt: str | None,
+        system_context: str | None,
+    ) -> list[BaseMessage]:
+        """
+        Prepend the system prompt to the conversation.
+
+        The static system prompt comes first, followed by the context, which in
+        practice changes far less often than the conversation (ADVISE sends the
+        same table context until the table is modified). Both therefore form a
+        stable prefix across turns. OpenAI caches such prefixes automatically;
+        Anthropic needs each block marked with cache_control, and a static
+        prompt alone is usually below its minimum cacheable length.
+
+        Args:
+            messages: Conversation history
+            system_prompt: Optional static system prompt
+            system_context: Optional per-call context appended to the system prompt
+
+        Returns:
+            Messages ready to send to the client
+        """
+        if not system_prompt and not system_context:
+            return list(messages)
+
+        if self.provider == "anthropic":
+            content: str | list[dict] = [
+                {"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}
+                for text in (system_prompt, system_context)
+                if text
+            ]
+        else:
+            content = (system_prompt or "") + (system_context or "")
+
+        return [SystemMessage(content=content), *messages]
+
     async def generate(
         self,
         messages: list[BaseMessage],
         system_prompt: str | None = None,
+        system_context: str | None = None,
     ) -> LLMResponse:
         """
         Generate a response from the LLM.
@@ -128,15 +186,12 @@ class LLMService:
         Args:
             messages: Conversation history
             system_prompt: Optional system prompt to prepend
+            system_context: Optional per-call context appended to the system prompt
 
         Returns:
             LLMResponse with content and metrics
         """
-        # Prepare messages with optional system prompt
-        all_messages = []
-        if system_prompt:
-            all_messages.append(SystemMessage(content=system_prompt))
-        all_messages.extend(messages)
+        all_messages = self._prepare_messages(messages, system_prompt, system_context)
 
         logger.debug(f"Generating response with {len(all_messages)} messages")
 
@@ -167,11 +222,42 @@ class LLMService:
             logger.error(f"LLM generation error: {e}")
             raise
 
+    async def stream(
+        self,
+        messages: list[BaseMessage],
+        system_prompt: str | None = None,
+        system_context: str | None = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a response from the LLM as it is generated.
+
+        Args:
+            messages: Conversation history
+            system_prompt: Optional system prompt to prepend
+            system_context: Optional per-call context appended to the system prompt
+
+        Yields:
+            Text chunks of the response
+        """
+        all_messages = self._prepare_messages(messages, system_prompt, system_context)
+
+        logger.debug(f"Streaming response with {len(all_messages)} messages")
+
+        try:
+            async for chunk in self.client.astream(all_messages):
+                if chunk.text:
+                    yield chunk.text
+
+        except Exception as e:
+            logger.error(f"LLM streaming error: {e}")
+            raise
+
     async def generate_structured(
         self,
         messages: list[BaseMessage],
         schema: type,
         system_prompt: str | None = None,
+        system_context: str | None = None,
     ):
         """
         Generate a structured response matching the given schema.
@@ -180,27 +266,63 @@ class LLMService:
             messages: Conversation history
             schema: Pydantic model class for structured output
             system_prompt: Optional system prompt
+            system_context: Optional per-call context appended to the system prompt
 
         Returns:
             Instance of the schema class
         """
-        # Prepare messages
-        all_messages = []
-        if system_prompt:
-            all_messages.append(SystemMessage(content=system_prompt))
-        all_messages.extend(messages)
-
-        # Use structured output
-        structured_client = self.client.with_structured_output(schema)
+        all_messages = self._prepare_messages(messages, system_prompt, system_context)
 
         try:
-            response = await structured_client.ainvoke(all_messages)
+            response = await self._structured_client(schema).ainvoke(all_messages)
             return response
 
         except Exception as e:
             logger.error(f"Structured generation error: {e}")
             raise
 
+    async def stream_structured(
+        self,
+        messages: list[BaseMessage],
+        schema: type,
+        system_prompt: str | None = None,
+        system_context: str | None = None,
+    ) -> AsyncIterator[Any]:
+        """
+        Stream a structured response as it is generated.
+
+        Each partial result is yielded once it validates against the schema, so
+        required fields are present but string and list values may be incomplete.
+
+        Args:
+            messages: Conversation history
+            schema: Pydantic model class for structured output
+            system_prompt: Optional system prompt
+            system_context: Optional per-call context appended to the system prompt
+
+        Yields:
+            Instances of the schema class, the last one complete
+        """
+        all_messages = self._prepare_messages(messages, system_prompt, system_context)
+
+        try:
+            async for partial in self._structured_client(schema).astream(all_messages):
+                yield partial
+
+        except Exception as e:
+            logger.error(f"Structured streaming error: {e}")
+            raise
+
+    def _structured_client(self, schema: type):
+        """Get the structured-output runnable for a schema, building it on first use."""
+        structured_client = self._structured_clients.get(schema)
+        if structured_client is None:
+            structured_client = self.client.with_structured_output(
+                schema, method=self.settings.structured_output_method
+            )
+            self._structured_clients[schema] = structured_client
+        return structured_client
+
     async def generate_with_web_search(
         self,
         messages: list[BaseMessage],
@@ -228,13 +350,8 @@ class LLMService:
                 f"Web search requires OpenAI provider. Current provider: {self.provider}"
             )
 
-        from openai import AsyncOpenAI
-
         config = web_search_config or WebSearchConfig()
 
-        # Create async OpenAI client
-        client = AsyncOpenAI(api_key=self.settings.openai_api_key)
-
         # Convert LangChain messages to Responses API format
         input_items = []
 
@@ -288,7 +405,7 @@ class LLMService:
             if previous_response_id:
                 request_kwargs["previous_response_id"] = previous_response_id
 
-            response = await self._call_openai_responses_api(client, request_kwargs)
+            response = await self._call_openai_responses_api(self.responses_client, request_kwargs)
 
             response_time = time.perf_counter() - start_time
 
@@ -373,6 +490,14 @@ class MockLLMClient:
         }
         return response
 
+    async def astream(self, messages: list[BaseMessage]) -> AsyncIterator[BaseMessage]:
+        """Stream the mock response one word at a time."""
+        from langchain_core.messages import AIMessageChunk
+
+        response = await self.ainvoke(messages)
+        for index, word in enumerate(response.content.split(" ")):
+            yield AIMessageChunk(content=word if index == 0 else f" {word}")
+
 
 @lru_cache
 def get_llm_service() -> LLMService:
@@ -1,16 +1,16 @@
 """Search strategy service for generating diverse product search queries."""
 
-import json
 from datetime import datetime
 from functools import lru_cache
 from pathlib import Path
 
-import yaml
+import orjson
 from langchain_core.messages import HumanMessage
 from pydantic import BaseModel, Field
 
 from app.services.llm import LLMService
 from app.utils.logger import get_logger
+from app.utils.yaml_loader import load_yaml
 
 logger = get_logger(__name__)
 
@@ -63,8 +63,7 @@ class SearchStrategyService:
     def _load_categories(self) -> dict:
         """Load the product categories knowledge base."""
         try:
-            with open(CATEGORIES_PATH) as f:
-                return yaml.safe_load(f)
+            return load_yaml(CATEGORIES_PATH)
         except Exception as e:
             logger.error(f"Failed to load categories: {e}")
             return {"categories": {}, "query_templates": {}, "regions": {}}
@@ -72,8 +71,7 @@ class SearchStrategyService:
     def _load_strategy(self) -> dict:
         """Load the search strategy configuration."""
         try:
-            with open(STRATEGY_PATH) as f:
-                return yaml.safe_load(f)
+            return load_yaml(STRATEGY_PATH)
         except Exception as e:
             logger.error(f"Failed to load strategy config: {e}")
             return {}
@@ -168,7 +166,7 @@ class SearchStrategyService:
             if budget_max
             else "No specific budget",
             "priorities": requirements.get("priorities", []),
-            "requirements_json": json.dumps(requirements, indent=2),
+            "requirements_json": orjson.dumps(requirements, option=orjson.OPT_INDENT_2).decode(),
         }
 
         return context
@@ -1,13 +1,23 @@
 """Utility functions and helpers."""
 
-from app.utils.hitl import clear_hitl_flags, is_hitl_message, parse_hitl_choice
+from app.utils.hitl import (
+    CLEARED_HITL_FLAGS,
+    HITL_PREFIX,
+    clear_hitl_flags,
+    is_hitl_message,
+    parse_hitl_choice,
+)
 from app.utils.logger import get_logger, setup_logging
 from app.utils.sanitization import sanitize_input
+from app.utils.yaml_loader import load_yaml
 
 __all__ = [
+    "CLEARED_HITL_FLAGS",
+    "HITL_PREFIX",
     "clear_hitl_flags",
     "get_logger",
     "is_hitl_message",
+    "load_yaml",
     "parse_hitl_choice",
     "sanitize_input",
     "setup_logging",
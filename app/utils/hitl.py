@@ -1,9 +1,32 @@
 """HITL (Human-in-the-Loop) utilities shared across agent nodes."""
 
 import logging
+import re
+from types import MappingProxyType
 
 logger = logging.getLogger(__name__)
 
+# Prefix of synthetic messages sent when the user clicks a HITL action button
+HITL_PREFIX = "[HITL:"
+
+# "[HITL:checkpoint:choice]" - the choice may itself contain colons
+_HITL_PATTERN = re.compile(r"\[HITL:[^:\]]+:(.+)\]\Z", re.DOTALL)
+
+# Cleared HITL state flags, splatted into node state updates. Read-only so the
+# shared mapping can't be mutated by a caller.
+CLEARED_HITL_FLAGS = MappingProxyType(
+    {
+        "awaiting_requirements_confirmation": False,
+        "awaiting_fields_confirmation": False,
+        "awaiting_intent_confirmation": False,
+        "action_choices": None,
+        "pending_requirements_summary": None,
+        "pending_field_definitions": None,
+        "pending_intent": None,
+        "pending_intent_details": None,
+    }
+)
+
 
 def parse_hitl_choice(content: str) -> str | None:
     """Extract choice from HITL synthetic message.
@@ -14,32 +37,15 @@ def parse_hitl_choice(content: str) -> str | None:
     Returns:
         The choice string, or None if not a valid HITL message
     """
-    if not content.startswith("[HITL:"):
-        return None
-    try:
-        inner = content[6:-1]  # Strip "[HITL:" and "]"
-        parts = inner.split(":", 1)
-        if len(parts) == 2:
-            return parts[1]
-    except Exception as e:
-        logger.debug(f"Failed to parse HITL message: {e}")
-    return None
+    match = _HITL_PATTERN.match(content)
+    return match.group(1) if match else None
 
 
 def clear_hitl_flags() -> dict:
     """Return dict of cleared HITL state flags for state updates."""
-    return {
-        "awaiting_requirements_confirmation": False,
-        "awaiting_fields_confirmation": False,
-        "awaiting_intent_confirmation": False,
-        "action_choices": None,
-        "pending_requirements_summary": None,
-        "pending_field_definitions": None,
-        "pending_intent": None,
-        "pending_intent_details": None,
-    }
+    return dict(CLEARED_HITL_FLAGS)
 
 
 def is_hitl_message(content: str) -> bool:
     """Check if content is a HITL synthetic message."""
-    return content.startswith("[HITL:") and content.endswith("]")
+    return content.startswith(HITL_PREFIX) and content.endswith("]")
@@ -0,0 +1,27 @@
+"""Cached loading of the YAML prompt and knowledge-base files."""
+
+from functools import lru_cache
+from pathlib import Path
+
+import yaml
+
+# Use the libyaml-backed safe loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@lru_cache
+def load_yaml(path: Path) -> dict:
+    """
+    Load and parse a YAML file, once per process.
+
+    The files ship with the app and don't change while it runs, so every caller
+    shares the parsed result. Treat it as read-only.
+
+    Args:
+        path: Path of the YAML file
+
+    Returns:
+        Parsed YAML content
+    """
+    with open(path) as f:
+        return yaml.load(f, Loader=_YAML_LOADER)
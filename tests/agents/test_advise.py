@@ -0,0 +1,378 @@
+"""Test ADVISE intent detection helpers."""
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import StateGraph
+from langgraph.graph.message import add_messages
+
+from app.agents.advise import (
+    MAX_CONTEXT_MESSAGES,
+    MAX_CONTEXT_PRODUCTS,
+    UserIntent,
+    _get_intent_description,
+    _get_table_context,
+    _intent_cache,
+    _match_add_fields,
+    _match_intent,
+    _recent_messages,
+    advise_node,
+)
+from app.models.schemas.shortlist import Candidate, ComparisonTable
+from app.models.state import AgentState
+
+
+class FakeLLMService:
+    """LLM service stub that classifies every message as a fixed intent."""
+
+    def __init__(self, intent_type: str):
+        self.intent_type = intent_type
+        self.classifications = 0
+
+    async def generate_structured(self, messages, schema, system_prompt=None):
+        self.classifications += 1
+        return UserIntent(intent_type=self.intent_type, reasoning="test")
+
+    async def stream(self, messages, system_prompt=None, system_context=None):
+        for chunk in ("Good", " question"):
+            yield chunk
+
+
+@pytest.fixture(autouse=True)
+def clear_intent_cache():
+    """Start each test without classifications cached by earlier tests."""
+    _intent_cache.clear()
+
+
+async def run_advise(state: AgentState) -> tuple[dict, list]:
+    """Run advise_node inside a graph, returning the final state and streamed tokens."""
+    graph = StateGraph(AgentState)
+    graph.add_node("advise", advise_node)
+    graph.set_entry_point("advise")
+
+    result = {}
+    tokens = []
+    async for mode, chunk in graph.compile().astream(state, stream_mode=["custom", "values"]):
+        if mode == "custom":
+            tokens.append(chunk["token"])
+        else:
+            result = chunk
+    return result, tokens
+
+
+class TestMatchIntent:
+    """Tests for the keyword intent fast path."""
+
+    @pytest.mark.parametrize(
+        ("message", "expected"),
+        [
+            ("Thanks!", "satisfied"),
+            ("That's all, I'm done", "satisfied"),
+            ("Perfect!", "satisfied"),
+            ("Show me more", "more_options"),
+            ("Any other products", "more_options"),
+            ("Actually my budget is £30", "change_requirements"),
+        ],
+    )
+    def test_unambiguous_messages_match(self, message, expected):
+        """Messages with keywords for a single intent should skip the LLM."""
+        assert _match_intent(message) == expected
+
+    def test_questions_defer_to_llm(self):
+        """Questions should always go to the LLM classifier."""
+        assert _match_intent("Any more options?") is None
+
+    def test_long_messages_defer_to_llm(self):
+        """Long messages should go to the LLM classifier even if a keyword matches."""
+        message = "Thanks, this is useful. My partner mentioned we also need it to fit under a low cabinet"
+        assert _match_intent(message) is None
+
+    def test_conflicting_intents_defer_to_llm(self):
+        """Keywords for more than one intent should go to the LLM classifier."""
+        assert _match_intent("Thanks, but show me more") is None
+
+    @pytest.mark.parametrize(
+        "message",
+        [
+            "Thanks, now add warranty",
+            "Thanks. Show me cheaper ones",
+            "thank you, what about the Smeg one",
+            "Thanks! Now compare noise levels",
+            "I'll go with the Breville, send me the link",
+        ],
+    )
+    def test_sign_off_with_request_defers_to_llm(self, message):
+        """A sign-off followed by another request should go to the LLM classifier."""
+        assert _match_intent(message) is None
+
+    def test_short_replies_only_match_whole_message(self):
+        """Short satisfied replies should not match inside a longer sentence."""
+        assert _match_intent("Done with the first three, what else is there") is None
+
+    @pytest.mark.parametrize("message", ["ok", "Great!"])
+    def test_agreement_defers_to_llm(self, message):
+        """Replies that may accept a suggestion should go to the LLM classifier."""
+        assert _match_intent(message) is None
+
+    def test_keywords_match_whole_words_only(self):
+        """Keywords inside other words should not match."""
+        assert _match_intent("A thanksgiving gift for my mum") is None
+
+
+class TestMatchAddFields:
+    """Tests for the add-fields fast path."""
+
+    @pytest.mark.parametrize(
+        ("message", "expected"),
+        [
+            ("add warranty and noise level", ["warranty", "noise level"]),
+            ("Please add warranty, weight & price to the table", ["warranty", "weight", "price"]),
+            ("Also include the warranty length too.", ["warranty length"]),
+            ("add a dishwasher safe column", ["dishwasher safe"]),
+        ],
+    )
+    def test_direct_requests_extract_fields(self, message, expected):
+        """Direct requests to add fields should skip the LLM and name the fields."""
+        assert _match_add_fields(message) == expected
+
+    @pytest.mark.parametrize(
+        "message",
+        [
+            "Can you add energy efficiency?",
+            "add it",
+            "add more options",
+            "add the breville to my shopping list",
+            "add the Breville",
+            "add smeg and breville",
+            "include cheaper ones",
+            "I want to add a budget",
+        ],
+    )
+    def test_unclear_requests_defer_to_llm(self, message):
+        """Questions, references and other requests should go to the LLM classifier."""
+        assert _match_add_fields(message) is None
+
+
+class TestIntentDescription:
+    """Tests for the intent confirmation text."""
+
+    def test_new_fields_lists_requested_fields(self):
+        """The description should name the fields and accept any iterable of them."""
+        expected = "I'll add warranty, noise level to the comparison."
+        assert _get_intent_description("new_fields", ["warranty", "noise level"]) == expected
+        assert _get_intent_description("new_fields", ("warranty", "noise level")) == expected
+
+    def test_unknown_intent_has_generic_description(self):
+        """Intents without specific text should fall back to a generic description."""
+        assert _get_intent_description("question") == "I'll help you with that."
+
+
+class TestRecentMessages:
+    """Tests for bounding the conversation sent to the LLM."""
+
+    def test_short_conversation_is_unchanged(self):
+        """Conversations under the limit should be sent in full."""
+        messages = [HumanMessage(content="hi"), AIMessage(content="hello")]
+        assert _recent_messages(messages) == messages
+
+    def test_long_conversation_is_trimmed_to_a_human_turn(self):
+        """Long conversations should keep a bounded tail starting with the user."""
+        messages = [
+            HumanMessage(content=f"q{i}") if i % 2 == 0 else AIMessage(content=f"a{i}")
+            for i in range(MAX_CONTEXT_MESSAGES * 2 + 1)
+        ]
+
+        recent = _recent_messages(messages)
+
+        assert len(recent) <= MAX_CONTEXT_MESSAGES
+        assert recent[0].type == "human"
+        assert recent[-1] is messages[-1]
+
+
+class TestTableContext:
+    """Tests for caching the rendered table context."""
+
+    def test_context_is_reused_until_table_changes(self):
+        """An unchanged table should reuse its render; a modified one should re-render."""
+        table = ComparisonTable()
+        table.add_row(Candidate(name="Kettle One", manufacturer="Brand"))
+
+        first = _get_table_context(table.model_dump())
+        assert _get_table_context(table.model_dump()) is first
+
+        table.add_row(Candidate(name="Kettle Two", manufacturer="Brand"))
+        updated = _get_table_context(table.model_dump())
+
+        assert updated is not first
+        assert "Kettle Two" in updated
+
+    def test_markdown_preview_is_not_rerendered_for_unchanged_table(self, monkeypatch):
+        """The markdown preview should be built once per table version."""
+        table = ComparisonTable()
+        table.add_row(Candidate(name="Kettle One", manufacturer="Brand"))
+        data = table.model_dump()
+
+        calls = []
+        to_markdown = ComparisonTable.to_markdown
+
+        def counting_to_markdown(self, *args, **kwargs):
+            calls.append(kwargs)
+            return to_markdown(self, *args, **kwargs)
+
+        monkeypatch.setattr(ComparisonTable, "to_markdown", counting_to_markdown)
+
+        _get_table_context(data)
+        _get_table_context(data)
+
+        assert len(calls) == 1
+
+    def test_context_lists_a_bounded_number_of_products(self):
+        """Only the top products should be rendered, while totals cover the whole table."""
+        table = ComparisonTable()
+        for i in range(MAX_CONTEXT_PRODUCTS + 5):
+            table.add_row(Candidate(name=f"Product {i:02d}", manufacturer="Brand"))
+
+        context = _get_table_context(table.model_dump())
+
+        assert f"Product {MAX_CONTEXT_PRODUCTS - 1:02d}" in context
+        assert f"Product {MAX_CONTEXT_PRODUCTS:02d}" not in context
+        assert f'"total_candidates": {MAX_CONTEXT_PRODUCTS + 5}' in context
+
+
+class TestIntentRouting:
+    """Tests for overlapping intent classification with the reply."""
+
+    @pytest.mark.asyncio
+    async def test_question_streams_the_speculative_reply(self, monkeypatch):
+        """A question should be answered with the reply generated during classification."""
+        monkeypatch.setattr("app.agents.advise.get_llm_service", lambda: FakeLLMService("question"))
+        state = AgentState(
+            messages=[HumanMessage(content="Which one is quietest?")],
+            advise_has_presented=True,
+        )
+
+        result, tokens = await run_advise(state)
+
+        assert result["messages"][-1].content == "Good question"
+        assert tokens == ["Good", " question"]
+
+    @pytest.mark.asyncio
+    async def test_satisfied_with_request_gets_a_generated_reply(self, monkeypatch):
+        """Only a bare sign-off should get the fixed farewell."""
+        monkeypatch.setattr(
+            "app.agents.advise.get_llm_service", lambda: FakeLLMService("satisfied")
+        )
+        state = AgentState(
+            messages=[HumanMessage(content="Thanks, I'll go with the Breville")],
+            advise_has_presented=True,
+        )
+
+        result, tokens = await run_advise(state)
+
+        assert result["current_phase"] == "complete"
+        assert result["messages"][-1].content == "Good question"
+
+    @pytest.mark.asyncio
+    async def test_confirmation_intents_drop_the_speculative_reply(self, monkeypatch):
+        """Intents that need confirmation should not stream any of the speculative reply."""
+        monkeypatch.setattr(
+            "app.agents.advise.get_llm_service", lambda: FakeLLMService("more_options")
+        )
+        state = AgentState(
+            messages=[HumanMessage(content="Could you look a bit wider?")],
+            advise_has_presented=True,
+        )
+
+        result, tokens = await run_advise(state)
+
+        assert result["pending_intent"] == "more_options"
+        assert tokens == []
+
+    @pytest.mark.asyncio
+    async def test_repeated_message_reuses_classification(self, monkeypatch):
+        """A message classified before should not be sent to the LLM classifier again."""
+        llm_service = FakeLLMService("question")
+        monkeypatch.setattr("app.agents.advise.get_llm_service", lambda: llm_service)
+
+        for message in ("Which one is quietest?", "which one is  quietest?"):
+            state = AgentState(
+                messages=[HumanMessage(content=message)],
+                advise_has_presented=True,
+            )
+            result, tokens = await run_advise(state)
+
+            assert result["messages"][-1].content == "Good question"
+            assert tokens == ["Good", " question"]
+
+        assert llm_service.classifications == 1
+
+    @pytest.mark.asyncio
+    async def test_same_message_in_new_context_is_classified_again(self, monkeypatch):
+        """A reply that refers back to the conversation should not reuse another's intent."""
+        llm_service = FakeLLMService("question")
+        monkeypatch.setattr("app.agents.advise.get_llm_service", lambda: llm_service)
+
+        for offer in ("Want me to add energy ratings?", "Want me to search for more?"):
+            state = AgentState(
+                messages=[
+                    HumanMessage(content="Compare kettles"),
+                    AIMessage(content=offer),
+                    HumanMessage(content="yes"),
+                ],
+                advise_has_presented=True,
+            )
+            await run_advise(state)
+
+        assert llm_service.classifications == 2
+
+    @pytest.mark.asyncio
+    async def test_uses_recorded_last_user_message(self):
+        """The message recorded on input should be classified without scanning history."""
+        state = AgentState(
+            messages=[HumanMessage(content="Which is cheapest?"), HumanMessage(content="[HITL:x]")],
+            last_user_message="Show me more",
+            advise_has_presented=True,
+        )
+
+        result, _ = await run_advise(state)
+
+        assert result["pending_intent"] == "more_options"
+
+
+class TestAdviseErrors:
+    """Tests for the ADVISE error path."""
+
+    @pytest.mark.asyncio
+    async def test_classifier_failure_still_answers(self, monkeypatch):
+        """A failed intent classification should fall back to the concurrent reply."""
+        llm_service = FakeLLMService("question")
+
+        async def failing_classifier(*args, **kwargs):
+            raise RuntimeError("classifier unavailable")
+
+        llm_service.generate_structured = failing_classifier
+        monkeypatch.setattr("app.agents.advise.get_llm_service", lambda: llm_service)
+        state = AgentState(
+            messages=[HumanMessage(content="Which one is quietest?")],
+            advise_has_presented=True,
+        )
+
+        result, tokens = await run_advise(state)
+
+        assert result["current_phase"] == "advise"
+        assert result["messages"][-1].content == "Good question"
+        assert tokens == ["Good", " question"]
+
+    @pytest.mark.asyncio
+    async def test_repeated_errors_append_separate_messages(self):
+        """Each failure should add its own message rather than replace the previous one."""
+        state = AgentState(
+            messages=[HumanMessage(content="Show me the results")],
+            living_table={"rows": "not a table"},
+        )
+
+        first = await advise_node(state)
+        second = await advise_node(state)
+        history = add_messages(first.update["messages"], second.update["messages"])
+
+        assert first.update["current_phase"] == "error"
+        assert len(history) == 2
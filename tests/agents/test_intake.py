@@ -0,0 +1,240 @@
+"""Test INTAKE prompt helpers."""
+
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import StateGraph
+
+from app.agents.intake import (
+    MAX_INTAKE_MESSAGES,
+    IntakeDecision,
+    UserRequirements,
+    _intake_cache,
+    _recent_messages,
+    format_requirements_context,
+    format_requirements_summary,
+    intake_node,
+)
+from app.models.state import AgentState
+
+
+class FakeLLMService:
+    """LLM service stub that returns a fixed result for each structured schema."""
+
+    def __init__(self, ready_to_search: bool = False):
+        self.ready_to_search = ready_to_search
+        self.calls = 0
+
+    async def generate_structured(self, messages, schema, system_prompt=None):
+        self.calls += 1
+        return UserRequirements(product_type="electric kettle")
+
+    async def stream_structured(self, messages, schema, system_prompt=None):
+        self.calls += 1
+        for response in ("Any", "Any budget in mind?"):
+            yield IntakeDecision(user_ready_to_search=self.ready_to_search, response=response)
+
+
+@pytest.fixture
+def llm_service(monkeypatch):
+    """Patch both INTAKE LLM services with one stub, starting with an empty cache."""
+    llm_service = FakeLLMService()
+    monkeypatch.setattr("app.agents.intake.get_intake_llm_service", lambda: llm_service)
+    monkeypatch.setattr("app.agents.intake.get_intake_chat_llm_service", lambda: llm_service)
+    _intake_cache.clear()
+    return llm_service
+
+
+async def run_intake(state: AgentState) -> tuple[dict, list]:
+    """Run intake_node inside a graph, returning the final state and streamed tokens."""
+    graph = StateGraph(AgentState)
+    graph.add_node("intake", intake_node)
+    graph.add_node("research", lambda state: {})
+    graph.set_entry_point("intake")
+
+    result = {}
+    tokens = []
+    async for mode, chunk in graph.compile().astream(state, stream_mode=["custom", "values"]):
+        if mode == "custom":
+            tokens.append(chunk["token"])
+        else:
+            result = chunk
+    return result, tokens
+
+
+class TestFormatRequirementsContext:
+    """Tests for formatting requirements into LLM prompts."""
+
+    def test_one_line_per_requirement(self):
+        """Scalars and lists should each render on a single line."""
+        requirements = {
+            "product_type": "electric kettle",
+            "budget_max": 50.0,
+            "must_haves": ["fast boil", "variable temperature"],
+        }
+
+        assert format_requirements_context(requirements) == (
+            "product_type: electric kettle\n"
+            "budget_max: 50.0\n"
+            "must_haves: fast boil, variable temperature"
+        )
+
+    def test_empty_lists_are_explicit(self):
+        """Empty lists should say none rather than render as a blank value."""
+        assert format_requirements_context({"constraints": []}) == "constraints: none"
+
+
+class TestFormatRequirementsSummary:
+    """Tests for the HITL requirements summary."""
+
+    def test_captured_requirements_are_listed_in_order(self):
+        """Each captured requirement should get its own labelled line."""
+        requirements = {
+            "constraints": ["plastic interior"],
+            "product_type": "electric kettle",
+            "budget_max": 50.0,
+            "must_haves": ["fast boil"],
+            "priorities": [],
+        }
+
+        assert format_requirements_summary(requirements) == (
+            "**Product:** electric kettle\n"
+            "**Budget:** Under $50.0\n"
+            "**Must have:** fast boil\n"
+            "**Avoid:** plastic interior"
+        )
+
+    def test_no_requirements_has_placeholder(self):
+        """An empty summary should say nothing was captured."""
+        assert format_requirements_summary({}) == "No specific requirements captured."
+
+
+class TestRecentMessages:
+    """Tests for bounding the conversation sent to the INTAKE LLMs."""
+
+    def test_long_conversation_is_trimmed_to_a_human_turn(self):
+        """Long conversations should keep a bounded tail starting with the user."""
+        messages = [
+            HumanMessage(content=f"q{i}") if i % 2 == 0 else AIMessage(content=f"a{i}")
+            for i in range(MAX_INTAKE_MESSAGES * 2 + 1)
+        ]
+
+        recent = _recent_messages(messages)
+
+        assert len(recent) <= MAX_INTAKE_MESSAGES
+        assert recent[0].type == "human"
+        assert recent[-1] is messages[-1]
+
+
+class TestIntakeCache:
+    """Tests for reusing INTAKE results for identical conversations."""
+
+    @pytest.mark.asyncio
+    async def test_identical_conversation_skips_llm(self, llm_service):
+        """A conversation seen before should reuse its extraction and reply."""
+        state = AgentState(messages=[HumanMessage(content="I need a new kettle")])
+        first, _ = await run_intake(state)
+        second, tokens = await run_intake(state)
+
+        assert llm_service.calls == 2
+        assert second["user_requirements"] == first["user_requirements"]
+        assert second["messages"][-1].content == "Any budget in mind?"
+        assert tokens == []
+
+
+class TestRequirementsMerge:
+    """Tests for merging extracted requirements into those already gathered."""
+
+    @pytest.mark.asyncio
+    async def test_unset_fields_keep_previous_values(self, llm_service):
+        """Fields the extraction leaves unset or empty should not erase earlier answers."""
+        state = AgentState(
+            messages=[HumanMessage(content="Make it an electric one")],
+            user_requirements={
+                "product_type": "kettle",
+                "budget_max": 50.0,
+                "must_haves": ["fast boil"],
+            },
+        )
+        result, _ = await run_intake(state)
+
+        assert result["user_requirements"] == {
+            "product_type": "electric kettle",
+            "budget_max": 50.0,
+            "must_haves": ["fast boil"],
+        }
+
+
+class TestReplyStreaming:
+    """Tests for streaming the INTAKE reply while it is decided."""
+
+    @pytest.mark.asyncio
+    async def test_reply_streams_as_it_is_decided(self, llm_service):
+        """Only the new part of each partial response should be streamed."""
+        state = AgentState(messages=[HumanMessage(content="I need a new kettle")])
+
+        result, tokens = await run_intake(state)
+
+        assert tokens == ["Any", " budget in mind?"]
+        assert result["messages"][-1].content == "Any budget in mind?"
+
+    @pytest.mark.asyncio
+    async def test_reply_is_not_streamed_when_ready_to_search(self, llm_service):
+        """A reply replaced by the search notice should not be streamed."""
+        llm_service.ready_to_search = True
+        state = AgentState(messages=[HumanMessage(content="Just search for kettles")])
+
+        result, tokens = await run_intake(state)
+
+        assert tokens == []
+        assert result["current_phase"] == "research"
+
+
+class TestReadyToSearchFastPath:
+    """Tests for starting the search without the LLM."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("message", ["Search now!", "let's search", "I'm ready."])
+    async def test_search_request_skips_llm(self, llm_service, message):
+        """A plain request to search should go straight to RESEARCH once the product is known."""
+        state = AgentState(
+            messages=[HumanMessage(content=message)],
+            user_requirements={"product_type": "electric kettle"},
+        )
+
+        result, _ = await run_intake(state)
+
+        assert llm_service.calls == 0
+        assert result["current_phase"] == "research"
+        assert result["user_requirements"] == {"product_type": "electric kettle"}
+
+    @pytest.mark.asyncio
+    async def test_search_request_without_product_uses_llm(self, llm_service):
+        """Without a product type there is nothing to search for, so the LLM should reply."""
+        state = AgentState(messages=[HumanMessage(content="search now")])
+
+        result, _ = await run_intake(state)
+
+        assert llm_service.calls == 2
+        assert result["current_phase"] == "intake"
+
+
+class TestIntakeTimeout:
+    """Tests for bounding how long INTAKE waits on the LLM."""
+
+    @pytest.mark.asyncio
+    async def test_stalled_llm_asks_user_to_retry(self, llm_service, monkeypatch):
+        """A turn that outlasts the timeout should stay in INTAKE rather than hang."""
+
+        async def stalled_extraction(*args, **kwargs):
+            await asyncio.sleep(1)
+
+        llm_service.generate_structured = stalled_extraction
+        monkeypatch.setattr("app.agents.intake.INTAKE_LLM_TIMEOUT", 0.01)
+        state = AgentState(messages=[HumanMessage(content="I need a new kettle")])
+
+        result, _ = await run_intake(state)
+
+        assert result["current_phase"] == "intake"
+        assert "send your message again" in result["messages"][-1].content
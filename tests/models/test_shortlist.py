@@ -375,6 +375,16 @@ class TestComparisonTable:
         qualified = table_with_fields.get_qualified_rows()
         assert len(qualified) == 1
         assert qualified[0].candidate.name == "Product 1"
+        assert table_with_fields.get_qualified_count() == 1
+
+    def test_version_key_changes_on_mutation(self, table_with_fields: ComparisonTable):
+        """version_key should be stable for unchanged data and change after a mutation."""
+        before = ComparisonTable.version_key(table_with_fields.model_dump())
+        assert ComparisonTable.version_key(table_with_fields.model_dump()) == before
+
+        table_with_fields.add_row(Candidate(name="Test Product", manufacturer="Test Brand"))
+
+        assert ComparisonTable.version_key(table_with_fields.model_dump()) != before
 
     def test_get_enrichment_progress(self, table_with_fields: ComparisonTable):
         """get_enrichment_progress should return correct counts."""
@@ -59,3 +59,4 @@ def test_create_initial_state_has_living_table_fields():
 
     # Requested fields should be empty list
     assert state["requested_fields"] == []
+    assert state["last_user_message"] is None
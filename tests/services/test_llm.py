@@ -1,5 +1,7 @@
 """LLM service tests."""
 
+import pytest
+
 
 def test_llm_service_init(mock_settings):
     """Test LLM service initialization."""
@@ -81,3 +83,77 @@ def test_web_search_requires_openai_provider(mock_settings):
 
     with pytest.raises(ValueError, match="Web search requires OpenAI provider"):
         asyncio.get_event_loop().run_until_complete(test_generate())
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_full_response(mock_settings):
+    """Test streamed chunks join up to the same content as generate."""
+    from app.services.llm import LLMService
+
+    service = LLMService(mock_settings)
+
+    chunks = [chunk async for chunk in service.stream(messages=[])]
+    response = await service.generate(messages=[])
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == response.content
+
+
+def test_system_context_follows_static_prompt(mock_settings):
+    """Test the per-call context is appended after the static system prompt."""
+    from app.services.llm import LLMService
+
+    service = LLMService(mock_settings)
+
+    messages = service._prepare_messages([], "Static prompt.", " Context.")
+
+    assert messages[0].content == "Static prompt. Context."
+
+
+def test_anthropic_system_prompt_is_cacheable(mock_settings):
+    """Test the static prompt and context are marked for Anthropic prompt caching."""
+    from app.services.llm import LLMService
+
+    service = LLMService(mock_settings)
+    service.provider = "anthropic"
+
+    messages = service._prepare_messages([], "Static prompt.", " Context.")
+
+    static, context = messages[0].content
+    assert static["cache_control"] == {"type": "ephemeral"}
+    assert context["cache_control"] == {"type": "ephemeral"}
+
+
+@pytest.mark.asyncio
+async def test_structured_client_is_built_once_per_schema(mock_settings):
+    """Test repeated structured calls reuse the structured-output runnable."""
+    from pydantic import BaseModel
+
+    from app.services.llm import LLMService
+
+    class Answer(BaseModel):
+        value: str
+
+    class StructuredClient:
+        async def ainvoke(self, messages):
+            return Answer(value="ok")
+
+    class Client:
+        def __init__(self):
+            self.builds = 0
+            self.methods = []
+
+        def with_structured_output(self, schema, method):
+            self.builds += 1
+            self.methods.append(method)
+            return StructuredClient()
+
+    service = LLMService(mock_settings)
+    service._client = Client()
+
+    await service.generate_structured(messages=[], schema=Answer)
+    result = await service.generate_structured(messages=[], schema=Answer)
+
+    assert result.value == "ok"
+    assert service._client.builds == 1
+    assert service._client.methods == ["function_calling"]